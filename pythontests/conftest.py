@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_token_dir(tmp_path, monkeypatch):
+    """
+    Per-user token files go to this test's tmp_path, never the real config dir.
+
+    Module state is per process, so the token directory is the only thing xdist
+    workers could otherwise share.
+    """
+    from simrai import api
+
+    tokens_dir = tmp_path / "spotify_tokens"
+    monkeypatch.setattr(api, "_tokens_dir", tokens_dir)
+    return tokens_dir
+
+
+@pytest.fixture(autouse=True)
+def reset_api_caches():
+    """Spotify profiles, token files and /queue bodies are cached in memory; start every test cold."""
+    from simrai import api
+
+    api._spotify_profiles.clear()
+    api._token_cache.clear()
+    api._refresh_locks.clear()
+    api._refresh_waiters.clear()
+    api._queue_responses.clear()
+    api._etag_bodies.clear()
+    api._oauth_states.clear()
+    for limiter in api._rate_limiters:
+        limiter.reset()
+    yield
+    api._spotify_profiles.clear()
+    api._token_cache.clear()
+    api._refresh_locks.clear()
+    api._refresh_waiters.clear()
+    api._queue_responses.clear()
+    api._etag_bodies.clear()
+    api._oauth_states.clear()
+    for limiter in api._rate_limiters:
+        limiter.reset()
@@ -243,4 +243,137 @@ def test_queue_endpoint_length_excludes_duration(monkeypatch) -> None:
     assert call_kwargs["soft"] is True, "other parameters should still be passed"
 
 
+def test_queue_endpoint_rejects_oversized_requests(monkeypatch) -> None:
+    """Out-of-range sizes and oversized text fail validation before the pipeline runs."""
+    fake = MagicMock(side_effect=_fake_generate_queue)
+    monkeypatch.setattr("simrai.api.generate_queue", fake, raising=True)
 
+    client = TestClient(app)
+    for body in (
+        {"mood": "test mood", "length": 10_000},
+        {"mood": "test mood", "length": 0},
+        {"mood": "test mood", "duration_minutes": 100_000},
+        {"mood": "x" * 5000},
+    ):
+        assert client.post("/queue", json=body).status_code == 422
+    fake.assert_not_called()
+
+
+def test_cors_preflight_is_cacheable_and_scoped() -> None:
+    """Preflight responses advertise explicit methods/headers and a one-day max-age."""
+    client = TestClient(app)
+    resp = client.options(
+        "/queue",
+        headers={
+            "Origin": "http://localhost:5658",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "Content-Type",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["access-control-max-age"] == "86400"
+    assert "POST" in resp.headers["access-control-allow-methods"]
+    assert "DELETE" not in resp.headers["access-control-allow-methods"]
+
+
+def test_identical_inflight_queue_requests_are_coalesced(monkeypatch) -> None:
+    """Concurrent identical /queue requests share a single generate_queue run."""
+    import asyncio
+    import threading
+
+    from simrai import api as api_mod
+
+    calls = []
+    gate = threading.Event()
+
+    def slow_generate_queue(mood_text: str, **kwargs) -> QueueResult:
+        calls.append((mood_text, kwargs))
+        gate.wait(timeout=5)
+        return _fake_generate_queue(mood_text, **kwargs)
+
+    monkeypatch.setattr("simrai.api.generate_queue", slow_generate_queue, raising=True)
+
+    async def run() -> list:
+        same = api_mod.QueueRequest(mood="rainy drive", length=5)
+        other = api_mod.QueueRequest(mood="rainy drive", length=6)
+        pending = [
+            asyncio.ensure_future(api_mod._generate_queue_coalesced(req))
+            for req in (same, same, other)
+        ]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*pending)
+
+    first, second, third = asyncio.run(run())
+
+    assert len(calls) == 2  # the two identical requests ran once; length=6 ran separately
+    assert first is second
+    assert third is not first
+    assert not api_mod._inflight_queues
+
+
+def test_repeated_queue_requests_are_served_from_cache(monkeypatch) -> None:
+    """An identical /queue request within the TTL reuses the encoded response."""
+    fake = MagicMock(side_effect=_fake_generate_queue)
+    monkeypatch.setattr("simrai.api.generate_queue", fake, raising=True)
+
+    client = TestClient(app)
+    body = {"mood": "cached mood", "length": 10}
+    first = client.post("/queue", json=body)
+    second = client.post("/queue", json=body)
+    other = client.post("/queue", json={**body, "soft": True})
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == "application/json"
+    assert other.status_code == 200
+    assert fake.call_count == 2
+
+
+def test_rule_based_fallback_queues_are_not_cached_while_groq_is_configured(monkeypatch) -> None:
+    """A queue built without Groq's answer is regenerated, so a recovered Groq is used next time."""
+    fake = MagicMock(side_effect=_fake_generate_queue)
+    monkeypatch.setattr("simrai.api.generate_queue", fake, raising=True)
+    monkeypatch.setattr("simrai.api.groq_configured", lambda: True)
+
+    client = TestClient(app)
+    body = {"mood": "fallback mood", "length": 10}
+    assert client.post("/queue", json=body).status_code == 200
+    assert client.post("/queue", json=body).status_code == 200
+
+    assert fake.call_count == 2
+
+
+def test_large_queue_responses_are_gzipped(monkeypatch) -> None:
+    """JSON bodies above the threshold are compressed for gzip-capable clients."""
+
+    def _long_queue(mood_text: str, **kwargs) -> QueueResult:
+        result = _fake_generate_queue(mood_text, **kwargs)
+        result.tracks = result.tracks * 40
+        return result
+
+    monkeypatch.setattr("simrai.api.generate_queue", _long_queue, raising=True)
+
+    client = TestClient(app)
+    resp = client.post("/queue", json={"mood": "big mood", "length": 40}, headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()["tracks"]) == 40
+
+
+def test_lifespan_shuts_down_and_rebuilds_queue_executor(monkeypatch) -> None:
+    """Shutdown releases the queue pool and a later startup serves /queue again."""
+    import simrai.api as api_mod
+
+    monkeypatch.setattr("simrai.api.generate_queue", _fake_generate_queue, raising=True)
+    monkeypatch.setattr("simrai.api._warmup_backends", lambda: None)
+
+    with TestClient(app) as client:
+        assert client.post("/queue", json={"mood": "first run", "length": 1}).status_code == 200
+        first_pool = api_mod._queue_executor
+    assert api_mod._queue_executor is None
+
+    with TestClient(app) as client:
+        assert client.post("/queue", json={"mood": "second run", "length": 1}).status_code == 200
+        assert api_mod._queue_executor is not first_pool
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from simrai import cache as cache_mod
+from simrai.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # touch "a" so "b" becomes the oldest
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod, "monotonic", lambda: now[0])
+
+    cache: TTLCache[str] = TTLCache(maxsize=8, ttl=30)
+    cache.set("k", "v")
+    now[0] += 29
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_supports_mapping_access(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod, "monotonic", lambda: now[0])
+
+    cache: TTLCache[str] = TTLCache(maxsize=8, ttl=30)
+    cache["session"] = "user"
+    assert "session" in cache
+    assert cache["session"] == "user"
+
+    now[0] += 31
+    assert "session" not in cache
+    try:
+        cache["session"]
+    except KeyError:
+        pass
+    else:  # pragma: no cover - expired entries must not be returned
+        raise AssertionError("expired entry was returned")
@@ -13,7 +13,7 @@ from __future__ import annotations
 from typer.testing import CliRunner
 from unittest.mock import patch
 
-from simrai.cli import app
+from simrai.cli import _bar, app
 from simrai.mood import MoodVector
 from simrai.pipeline import QueueResult, QueueTrack
 
@@ -48,7 +48,7 @@ def test_cli_queue_command_smoke() -> None:
     """
     runner = CliRunner()
 
-    with patch("simrai.cli.generate_queue", _fake_queue):
+    with patch("simrai.pipeline.generate_queue", _fake_queue):
         result = runner.invoke(app, ["queue", "happy mood", "--length", "8"])
 
     assert result.exit_code == 0
@@ -58,3 +58,11 @@ def test_cli_queue_command_smoke() -> None:
     assert "Test Artist" in result.stdout
 
 
+def test_bar_clamps_rounds_half_to_even_and_tolerates_nan() -> None:
+    assert _bar(-0.5) == "········"
+    assert _bar(1.5) == "████████"
+    # 0.0625 * 8 == 0.5 and 0.3125 * 8 == 2.5: halves round to even, as round() does.
+    assert _bar(0.0625) == "········"
+    assert _bar(0.3125) == "██······"
+    assert _bar(float("nan")) == "········"
+    assert _bar(0.5, width=4) == "██··"
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from simrai.config import load_config
+
+
+def test_load_config_is_cached_until_cleared(monkeypatch) -> None:
+    load_config.cache_clear()
+    monkeypatch.setenv("SIMRAI_SPOTIFY_CLIENT_ID", "first-id")
+    first = load_config()
+
+    monkeypatch.setenv("SIMRAI_SPOTIFY_CLIENT_ID", "second-id")
+    assert load_config() is first
+
+    load_config.cache_clear()
+    try:
+        assert load_config().spotify.client_id == "second-id"
+    finally:
+        load_config.cache_clear()
@@ -1,8 +1,25 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
 from simrai.mood import MoodInterpretation, interpret_mood
 import simrai.mood as mood_mod
 
+# Keep a handle on the real Groq helper before the autouse fixture stubs it out.
+_real_call_groq_mood_ai = mood_mod._call_groq_mood_ai
+
+
+@pytest.fixture(autouse=True)
+def isolate_mood_cache(monkeypatch, tmp_path) -> None:
+    """Keep the Groq result cache empty and off the real config directory."""
+    monkeypatch.setattr(mood_mod, "_MOOD_DISK_CACHE_PATH", tmp_path / "mood_ai.json")
+    monkeypatch.setattr(mood_mod, "_MOOD_DISK_CACHE", None)
+    mood_mod._MOOD_CACHE.clear()
+    monkeypatch.setattr(mood_mod, "_GROQ_CLIENT", None)
+
 
 @pytest.fixture(autouse=True)
 def disable_groq_in_tests(monkeypatch) -> None:
@@ -39,6 +56,7 @@ def test_interpret_mood_valence_energy_ranges(
 def test_interpret_mood_metadata_preferences() -> None:
     text = "underground obscure deep classic 90s hits new 2024"
     interp = interpret_mood(text)
+    assert interp.from_groq is False
 
     # All preference flags should be derivable from the wording.
     assert interp.prefer_obscure is True
@@ -47,6 +65,15 @@ def test_interpret_mood_metadata_preferences() -> None:
     assert interp.prefer_classics is True
 
 
+def test_interpret_mood_tokenizes_punctuation_and_hyphens(monkeypatch) -> None:
+    monkeypatch.setattr("simrai.mood._call_groq_mood_ai", lambda *a, **k: None)
+    interp = interpret_mood("Sad, lonely... old-school b-sides!")
+
+    assert interp.vector.valence < 0.5
+    assert interp.prefer_classics is True
+    assert interp.prefer_obscure is True
+
+
 def test_interpret_mood_search_terms_include_flags() -> None:
     text = "late night drive"
     interp_soft = interpret_mood(text, soft=True)
@@ -91,4 +118,194 @@ def test_interpret_mood_uses_ai_data_when_available(monkeypatch) -> None:
     assert "some mood text" in interp.search_terms
     assert any("deep focus" in s for s in interp.search_terms)
     assert any("late night study" in s for s in interp.search_terms)
+    assert interp.from_groq is True
+
+
+def test_interpret_mood_fills_fields_missing_from_ai_with_rules(monkeypatch) -> None:
+    monkeypatch.setattr(mood_mod, "_call_groq_mood_ai", lambda *a, **k: {"valence": 0.9, "prefer_popular": True})
+
+    interp = interpret_mood("sleep hits classic", soft=True)
+
+    assert interp.vector.valence == pytest.approx(0.9)
+    assert interp.vector.energy == pytest.approx(0.1)  # "sleep" and --soft, from the keyword rules
+    assert interp.prefer_popular is True
+    assert interp.prefer_classics is True
+
+
+def _install_fake_groq(monkeypatch) -> list:
+    """Patch in a Groq client whose completions return a fixed JSON object."""
+    calls = []
+
+    def fake_create(**kwargs):
+        calls.append(kwargs)
+        content = json.dumps({"valence": 0.2, "energy": 0.8, "search_terms": ["storm"]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    class _FakeGroq:
+        def __init__(self, api_key: str, **kwargs) -> None:  # noqa: ARG002
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+
+    monkeypatch.setattr(mood_mod, "Groq", _FakeGroq)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    return calls
+
+
+def test_call_groq_mood_ai_requests_json_mode(monkeypatch) -> None:
+    """The Groq call should be a single JSON-mode completion parsed directly."""
+    calls = _install_fake_groq(monkeypatch)
+
+    data = _real_call_groq_mood_ai("stormy night", intense=False, soft=False)
+
+    assert data == {"valence": 0.2, "energy": 0.8, "search_terms": ["storm"]}
+    assert len(calls) == 1
+    assert calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_call_groq_mood_ai_caches_results(monkeypatch) -> None:
+    """Repeated and reordered prompts are served from cache, in memory and on disk."""
+    calls = _install_fake_groq(monkeypatch)
+
+    first = _real_call_groq_mood_ai("rainy midnight drive", intense=False, soft=False)
+    again = _real_call_groq_mood_ai("Rainy  midnight drive", intense=False, soft=False)
+    assert again == first
+    assert len(calls) == 1
+
+    # A fresh process (empty memory tier) still hits the disk tier for a reordered prompt.
+    mood_mod._MOOD_CACHE.clear()
+    monkeypatch.setattr(mood_mod, "_MOOD_DISK_CACHE", None)
+    reordered = _real_call_groq_mood_ai("midnight drive rainy", intense=False, soft=False)
+    assert reordered == first
+    assert len(calls) == 1
+
+    # Different flags are a different request.
+    _real_call_groq_mood_ai("rainy midnight drive", intense=True, soft=False)
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_bounded_and_prunes_expired_entries(monkeypatch) -> None:
+    """Stores evict the oldest entries past the cap and drop expired ones."""
+    monkeypatch.setattr(mood_mod, "_MOOD_DISK_CACHE_MAX_ENTRIES", 2)
+    mood_mod._MOOD_DISK_CACHE = {"stale": {"ts": 0.0, "data": {"valence": 0.5}}}
+
+    mood_mod._store_cached_mood_ai("first", False, False, {"valence": 0.1})
+    assert "stale" not in mood_mod._MOOD_DISK_CACHE
+
+    mood_mod._store_cached_mood_ai("second", False, False, {"valence": 0.2})
+    mood_mod._store_cached_mood_ai("third", False, False, {"valence": 0.3})
+    on_disk = json.loads(mood_mod._MOOD_DISK_CACHE_PATH.read_text())
+    assert [entry["data"]["valence"] for entry in on_disk.values()] == [0.2, 0.3]
+
+
+def test_call_groq_mood_ai_coalesces_concurrent_identical_requests(monkeypatch) -> None:
+    """A second identical request made while the first is in flight shares its result."""
+    calls = []
+    release = threading.Event()
+
+    def slow_create(**kwargs):
+        calls.append(kwargs)
+        release.wait(timeout=5)
+        content = json.dumps({"valence": 0.4, "energy": 0.6})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    class _FakeGroq:
+        def __init__(self, api_key: str, **kwargs) -> None:  # noqa: ARG002
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=slow_create))
+
+    monkeypatch.setattr(mood_mod, "Groq", _FakeGroq)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    # Bypass the result cache so a late follower would show up as a second call.
+    monkeypatch.setattr(mood_mod, "_get_cached_mood_ai", lambda *a: None)
+
+    results = []
+
+    def worker() -> None:
+        results.append(_real_call_groq_mood_ai("foggy harbor", intense=False, soft=False))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    while not calls:
+        time.sleep(0.005)
+    follower = threading.Thread(target=worker)
+    follower.start()
+    time.sleep(0.1)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == [{"valence": 0.4, "energy": 0.6}] * 2
+    assert not mood_mod._GROQ_INFLIGHT
+
+
+def test_groq_client_is_reused_across_calls(monkeypatch) -> None:
+    """The Groq client (and its pooled HTTP/2 connection) is built once per API key."""
+    created = []
+
+    class _FakeGroq:
+        def __init__(self, api_key: str, **kwargs) -> None:
+            created.append((api_key, kwargs))
+
+    monkeypatch.setattr(mood_mod, "Groq", _FakeGroq)
+
+    first = mood_mod._get_groq_client("key-a")
+    assert mood_mod._get_groq_client("key-a") is first
+    assert len(created) == 1
+    assert created[0][1]["http_client"] is not None
+    assert created[0][1]["max_retries"] == 0
+    assert created[0][1]["timeout"] == mood_mod._GROQ_TIMEOUT_SECONDS
+
+
+def test_close_groq_client_closes_and_drops_the_shared_client(monkeypatch) -> None:
+    """Closing releases the pooled client; a key change or later call builds a fresh one."""
+    closed = []
+
+    class _FakeGroq:
+        def __init__(self, api_key: str, **kwargs) -> None:
+            self.api_key = api_key
+
+        def close(self) -> None:
+            closed.append(self.api_key)
+
+    monkeypatch.setattr(mood_mod, "Groq", _FakeGroq)
+
+    first = mood_mod._get_groq_client("key-a")
+    second = mood_mod._get_groq_client("key-b")
+    assert second is not first
+    assert closed == ["key-a"]
+
+    mood_mod.close_groq_client()
+    assert closed == ["key-a", "key-b"]
+    assert mood_mod._get_groq_client("key-b") is not second
+
+
+def test_interpret_mood_dedupes_search_terms(monkeypatch) -> None:
+    """AI terms that repeat the mood text or flag words (any case) are dropped."""
+    monkeypatch.setattr(
+        mood_mod,
+        "_call_groq_mood_ai",
+        lambda *a, **k: {"search_terms": ["Late Night Drive", "CHILL", "synthwave", "synthwave "]},
+    )
+
+    interp = interpret_mood("late night drive", soft=True)
+
+    assert interp.search_terms == ["late night drive", "acoustic", "chill", "synthwave"]
+
+
+def test_can_call_groq_admits_per_minute_budget(monkeypatch) -> None:
+    import array
+
+    now = [1000.0]
+    monkeypatch.setattr(mood_mod, "monotonic", lambda: now[0])
+    monkeypatch.setattr(mood_mod, "_GROQ_MAX_CALLS_PER_MINUTE", 2)
+    monkeypatch.setattr(mood_mod, "_GROQ_CALL_RING", array.array("d", [float("-inf")] * 2))
+    monkeypatch.setattr(mood_mod, "_GROQ_CALL_POS", 0)
+
+    assert mood_mod._can_call_groq() is True
+    now[0] += 10
+    assert mood_mod._can_call_groq() is True
+    assert mood_mod._can_call_groq() is False
 
+    # The first slot frees up once its call is more than a minute old.
+    now[0] += 51
+    assert mood_mod._can_call_groq() is True
+    assert mood_mod._can_call_groq() is False
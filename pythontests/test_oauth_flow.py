@@ -2,11 +2,13 @@
 Comprehensive test suite for OAuth flow: login, callback, token management.
 """
 
+import json
+
 import pytest
 import time
 import secrets
 import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from simrai import api
@@ -120,6 +122,19 @@ class TestOAuthCallback:
         assert "Connection Denied" in resp.text
         assert "access_denied" in resp.text
 
+    def test_auth_callback_escapes_denial_error(self):
+        """Spotify's error parameters must not be able to inject markup or script."""
+        client = TestClient(app)
+        resp = client.get(
+            "/auth/callback",
+            params={"error": '"</script><script>alert(1)</script>', "error_description": "<img src=x>"},
+        )
+
+        assert resp.status_code == 200
+        assert "<script>alert(1)" not in resp.text
+        assert "<img src=x>" not in resp.text
+        assert "&lt;img src=x&gt;" in resp.text
+
     def test_auth_callback_requires_client_credentials(self):
         """Test that callback requires Spotify client credentials."""
         with patch.object(api, '_cfg') as mock_cfg:
@@ -128,7 +143,7 @@ class TestOAuthCallback:
             
             # Create valid state
             state = secrets.token_urlsafe(32)
-            api._oauth_states[state] = time.time()
+            api._oauth_states[state] = time.monotonic() + api._OAUTH_STATE_TTL_SECONDS
             
             client = TestClient(app)
             resp = client.get(f"/auth/callback?code=test_code&state={state}")
@@ -139,33 +154,33 @@ class TestOAuthCallback:
     def test_auth_callback_exchanges_code_for_tokens(self):
         """Test successful token exchange flow."""
         with patch.object(api, '_cfg') as mock_cfg, \
-             patch.object(api, '_oauth_http') as mock_http:
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http:
             mock_cfg.spotify.client_id = "test_client_id"
             mock_cfg.spotify.client_secret = "test_secret"
             
             # Create valid state
             state = secrets.token_urlsafe(32)
-            api._oauth_states[state] = time.time()
+            api._oauth_states[state] = time.monotonic() + api._OAUTH_STATE_TTL_SECONDS
             
             # Mock token exchange response
             mock_token_resp = Mock()
             mock_token_resp.status_code = 200
-            mock_token_resp.json.return_value = {
+            mock_token_resp.content = json.dumps({
                 "access_token": "test_access_token",
                 "refresh_token": "test_refresh_token",
                 "expires_in": 3600,
                 "token_type": "Bearer",
                 "scope": "playlist-modify-private playlist-modify-public"
-            }
+            }).encode()
             
             # Mock user profile response
             mock_me_resp = Mock()
             mock_me_resp.is_success = True
-            mock_me_resp.json.return_value = {
+            mock_me_resp.content = json.dumps({
                 "id": "test_user_id",
                 "display_name": "Test User",
                 "images": []
-            }
+            }).encode()
             
             mock_http.post.return_value = mock_token_resp
             mock_http.get.return_value = mock_me_resp
@@ -186,13 +201,13 @@ class TestOAuthCallback:
     def test_auth_callback_handles_token_exchange_failure(self):
         """Test that callback handles token exchange failures."""
         with patch.object(api, '_cfg') as mock_cfg, \
-             patch.object(api, '_oauth_http') as mock_http:
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http:
             mock_cfg.spotify.client_id = "test_client_id"
             mock_cfg.spotify.client_secret = "test_secret"
             
             # Create valid state
             state = secrets.token_urlsafe(32)
-            api._oauth_states[state] = time.time()
+            api._oauth_states[state] = time.monotonic() + api._OAUTH_STATE_TTL_SECONDS
             
             # Mock failed token exchange
             mock_resp = Mock()
@@ -224,7 +239,7 @@ class TestTokenManagement:
         with patch.object(api, '_cfg') as mock_cfg, \
              patch.object(api, '_load_tokens') as mock_load, \
              patch.object(api, '_save_tokens') as mock_save, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_cfg.spotify.client_id = "test_client_id"
             mock_cfg.spotify.client_secret = "test_secret"
@@ -239,20 +254,20 @@ class TestTokenManagement:
             # Mock refresh response
             mock_refresh_resp = Mock()
             mock_refresh_resp.status_code = 200
-            mock_refresh_resp.json.return_value = {
+            mock_refresh_resp.content = json.dumps({
                 "access_token": "new_token",
                 "expires_in": 3600
-            }
+            }).encode()
             mock_http.post.return_value = mock_refresh_resp
             
             # Mock /me response
             mock_me_resp = Mock()
             mock_me_resp.is_success = True
-            mock_me_resp.json.return_value = {
+            mock_me_resp.content = json.dumps({
                 "id": "test_user",
                 "display_name": "Test User",
                 "images": []
-            }
+            }).encode()
             mock_http.get.return_value = mock_me_resp
             
             client = TestClient(app)
@@ -3,11 +3,22 @@ from __future__ import annotations
 from typing import List, Optional
 from unittest.mock import patch
 
+import pytest
+
 from simrai.mood import MoodInterpretation, MoodVector
+from simrai import pipeline as pipeline_mod
 from simrai.pipeline import QueueResult, QueueTrack, generate_queue
 from simrai.spotify import SpotifyService
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_spotify_service():
+    """Each test patches SpotifyService, so never reuse another test's shared instance."""
+    pipeline_mod.close_spotify_service()
+    yield
+    pipeline_mod.close_spotify_service()
+
+
 class _FakeSpotifyService:
     """
     Fake SpotifyService used to drive the pipeline in tests.
@@ -69,6 +80,9 @@ class _FakeSpotifyService:
     def search_tracks(self, query: str, *, limit: int = 20) -> List[dict]:  # noqa: ARG002
         return self._candidates[:limit]
 
+    def warmup(self) -> None:
+        return None
+
     def close(self) -> None:  # pragma: no cover - no-op
         return None
 
@@ -121,6 +135,43 @@ def test_generate_queue_metadata_ranking_variation(monkeypatch) -> None:
     assert len(energies) > 0, "Should have energy values"
 
 
+def test_generate_queue_keeps_top_ranked_tracks_by_count(monkeypatch) -> None:
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        self._backend = _FakeSpotifyService()
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+    neutral = MoodInterpretation(vector=MoodVector(valence=0.5, energy=0.5), search_terms=["x"])
+
+    result = generate_queue("x", length=3, mood_override=neutral)
+
+    # With no preferences the ranking is plain popularity: 90, 70, 50.
+    assert {t.uri for t in result.tracks} == {
+        "spotify:track:id_pop_recent",
+        "spotify:track:id_short_track",
+        "spotify:track:id_mid_pop",
+    }
+
+
+def test_generate_queue_orders_energy_ties_by_rank_when_all_tracks_fit(monkeypatch) -> None:
+    """Tracks clamped to the same energy stay in score order even when none are dropped."""
+
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        self._backend = _FakeSpotifyService()
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+    energetic = MoodInterpretation(vector=MoodVector(valence=0.5, energy=1.0), search_terms=["x"])
+
+    result = generate_queue("x", length=10, mood_override=energetic)
+
+    tied = [t.uri for t in result.tracks if t.energy == 1.0]
+    # Popularity 90, 70, 50 -- not the order the search returned them in.
+    assert tied == [
+        "spotify:track:id_pop_recent",
+        "spotify:track:id_short_track",
+        "spotify:track:id_mid_pop",
+    ]
+
+
 def test_generate_queue_always_uses_metadata_pipeline(monkeypatch) -> None:
     """
     Test that generate_queue always uses the metadata-first pipeline without CrewAI.
@@ -244,4 +295,77 @@ def test_generate_queue_duration_fallback_to_length(monkeypatch) -> None:
         assert track.duration_ms is not None, "Tracks should have duration_ms even in length mode"
 
 
+def test_generate_queue_uses_mood_override(monkeypatch) -> None:
+    """A supplied interpretation is used as-is and interpret_mood is never called."""
+
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        self._backend = _FakeSpotifyService()
+
+    def fail_interpret(*args, **kwargs):  # pragma: no cover - must not run
+        raise AssertionError("interpret_mood should be bypassed")
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+    monkeypatch.setattr("simrai.pipeline.interpret_mood", fail_interpret)
+
+    override = MoodInterpretation(vector=MoodVector(valence=0.3, energy=0.7), search_terms=["override"])
+    result = generate_queue("ignored text", length=3, mood_override=override)
+
+    assert result.mood_vector is override.vector
+    assert len(result.tracks) == 3
+
+
+def test_generate_queue_reuses_shared_spotify_service(monkeypatch) -> None:
+    """Consecutive queues share one SpotifyService (token + connection pool)."""
+    inits = []
+
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        inits.append(self)
+        self._backend = _FakeSpotifyService()
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+
+    generate_queue("happy party", length=2)
+    generate_queue("sad night", length=2)
+
+    assert len(inits) == 1
+    assert pipeline_mod.get_spotify_service() is inits[0]
+
+
+def test_generate_queue_leaves_warmup_to_pipeline_warmup(monkeypatch) -> None:
+    """Token prefetch happens only via pipeline.warmup(), never per queue."""
+    warmups = []
+
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        self._backend = _FakeSpotifyService()
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+    monkeypatch.setattr(_FakeSpotifyService, "warmup", lambda self: warmups.append(self))
+    monkeypatch.setattr("simrai.pipeline.warmup_groq", lambda: None)
+
+    generate_queue("happy party", length=2)
+    assert warmups == []
+
+    pipeline_mod.warmup()
+    assert len(warmups) == 1
+
+
+def test_generate_queue_drops_near_duplicate_releases(monkeypatch) -> None:
+    class _DupService(_FakeSpotifyService):
+        def __init__(self) -> None:
+            super().__init__()
+            original = dict(self._candidates[0], id="id_dup", uri="spotify:track:id_dup")
+            original["name"] = "Hype Club Remix - Remastered 2011"
+            self._candidates.append(original)
+
+    def fake_service_init(self, cfg: Optional[object] = None) -> None:  # noqa: ARG002
+        self._backend = _DupService()
+
+    monkeypatch.setattr(SpotifyService, "__init__", fake_service_init, raising=True)
+    neutral = MoodInterpretation(vector=MoodVector(valence=0.5, energy=0.5), search_terms=["x"])
+
+    result = generate_queue("x", length=10, mood_override=neutral)
 
+    uris = [t.uri for t in result.tracks]
+    assert "spotify:track:id_pop_recent" in uris
+    assert "spotify:track:id_dup" not in uris
+    assert len(uris) == 5
@@ -2,8 +2,10 @@
 Test suite for playlist operations: create, add tracks, error handling.
 """
 
+import json
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from simrai import api
@@ -25,7 +27,7 @@ class TestCreatePlaylist:
         """Test successful playlist creation."""
         with patch.object(api, '_cfg') as mock_cfg, \
              patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}), \
              patch.object(api, '_record_playlist_event') as mock_record:
             mock_cfg.spotify.client_id = "test_client_id"
@@ -34,15 +36,15 @@ class TestCreatePlaylist:
             # Mock /me response
             mock_me_resp = Mock()
             mock_me_resp.is_success = True
-            mock_me_resp.json.return_value = {"id": "test_user"}
+            mock_me_resp.content = json.dumps({"id": "test_user"}).encode()
             
             # Mock playlist creation response
             mock_playlist_resp = Mock()
             mock_playlist_resp.is_success = True
-            mock_playlist_resp.json.return_value = {
+            mock_playlist_resp.content = json.dumps({
                 "id": "playlist_123",
                 "external_urls": {"spotify": "https://open.spotify.com/playlist/123"}
-            }
+            }).encode()
             
             mock_http.get.return_value = mock_me_resp
             mock_http.post.return_value = mock_playlist_resp
@@ -69,21 +71,21 @@ class TestCreatePlaylist:
         """Test that playlist uses default name if not provided."""
         with patch.object(api, '_cfg') as mock_cfg, \
              patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_cfg.spotify.client_id = "test_client_id"
             mock_token.return_value = "test_access_token"
             
             mock_me_resp = Mock()
             mock_me_resp.is_success = True
-            mock_me_resp.json.return_value = {"id": "test_user"}
+            mock_me_resp.content = json.dumps({"id": "test_user"}).encode()
             
             mock_playlist_resp = Mock()
             mock_playlist_resp.is_success = True
-            mock_playlist_resp.json.return_value = {
+            mock_playlist_resp.content = json.dumps({
                 "id": "playlist_123",
                 "external_urls": {"spotify": "https://open.spotify.com/playlist/123"}
-            }
+            }).encode()
             
             mock_http.get.return_value = mock_me_resp
             mock_http.post.return_value = mock_playlist_resp
@@ -97,18 +99,66 @@ class TestCreatePlaylist:
             call_args = mock_http.post.call_args
             assert "SIMRAI Playlist" in str(call_args)
 
+    def test_create_playlist_reuses_cached_user_id(self):
+        """A second playlist for the same token skips the Spotify /me call."""
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}), \
+             patch.object(api, '_record_playlist_event'):
+            mock_token.return_value = "test_access_token"
+
+            mock_me_resp = Mock()
+            mock_me_resp.is_success = True
+            mock_me_resp.content = json.dumps({"id": "test_user"}).encode()
+            mock_playlist_resp = Mock()
+            mock_playlist_resp.is_success = True
+            mock_playlist_resp.content = json.dumps({"id": "playlist_123", "external_urls": {}}).encode()
+            mock_http.get.return_value = mock_me_resp
+            mock_http.post.return_value = mock_playlist_resp
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            assert client.post("/api/create-playlist", json={"name": "One"}).status_code == 200
+            assert client.post("/api/create-playlist", json={"name": "Two"}).status_code == 200
+
+            assert mock_http.get.await_count == 1
+            assert mock_http.post.await_count == 2
+            assert "/users/test_user/playlists" in mock_http.post.call_args[0][0]
+
+    def test_create_playlist_uses_stored_spotify_id(self, tmp_path):
+        """The Spotify id saved at OAuth time replaces the /me lookup entirely."""
+        with patch.object(api, '_tokens_dir', tmp_path), \
+             patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "stored_user"}), \
+             patch.object(api, '_record_playlist_event'):
+            mock_token.return_value = "test_access_token"
+            api._save_tokens("stored_user", {"access_token": "test_access_token", "user_id": "stored_user"})
+
+            mock_playlist_resp = Mock()
+            mock_playlist_resp.is_success = True
+            mock_playlist_resp.content = json.dumps({"id": "playlist_123", "external_urls": {}}).encode()
+            mock_http.post.return_value = mock_playlist_resp
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            assert client.post("/api/create-playlist", json={"name": "One"}).status_code == 200
+
+            mock_http.get.assert_not_called()
+            assert "/users/stored_user/playlists" in mock_http.post.call_args[0][0]
+
     def test_create_playlist_handles_spotify_error(self):
         """Test that playlist creation handles Spotify API errors."""
         with patch.object(api, '_cfg') as mock_cfg, \
              patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_cfg.spotify.client_id = "test_client_id"
             mock_token.return_value = "test_access_token"
             
             mock_me_resp = Mock()
             mock_me_resp.is_success = True
-            mock_me_resp.json.return_value = {"id": "test_user"}
+            mock_me_resp.content = json.dumps({"id": "test_user"}).encode()
             
             # Mock failed playlist creation
             mock_playlist_resp = Mock()
@@ -135,7 +185,7 @@ class TestAddTracks:
         client = TestClient(app)
         resp = client.post(
             "/api/add-tracks",
-            json={"playlist_id": "playlist_123", "uris": ["spotify:track:abc"]}
+            json={"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": ["spotify:track:4uLU6hMCjMI75M1A2tKUQC"]}
         )
         
         assert resp.status_code == 401
@@ -144,13 +194,13 @@ class TestAddTracks:
     def test_add_tracks_success(self):
         """Test successful track addition."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
             mock_resp = Mock()
             mock_resp.is_success = True
-            mock_resp.json.return_value = {"snapshot_id": "snapshot_123"}
+            mock_resp.content = json.dumps({"snapshot_id": "snapshot_123"}).encode()
             mock_http.post.return_value = mock_resp
             
             client = TestClient(app)
@@ -158,8 +208,8 @@ class TestAddTracks:
             resp = client.post(
                 "/api/add-tracks",
                 json={
-                    "playlist_id": "playlist_123",
-                    "uris": ["spotify:track:abc", "spotify:track:def"]
+                    "playlist_id": "37i9dQZF1DXcBWIGoYBM5M",
+                    "uris": ["spotify:track:4uLU6hMCjMI75M1A2tKUQC", "spotify:track:7ouMYWpwJ422jRcDASZB7P"]
                 }
             )
             
@@ -167,6 +217,59 @@ class TestAddTracks:
             data = resp.json()
             assert data["snapshot_id"] == "snapshot_123"
 
+    def test_add_tracks_chunks_large_uploads_in_order(self):
+        """More than 100 URIs are sent as ordered 100-URI chunks."""
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}):
+            mock_token.return_value = "test_access_token"
+
+            mock_resp = Mock()
+            mock_resp.is_success = True
+            mock_resp.status_code = 201
+            mock_resp.content = json.dumps({"snapshot_id": "snapshot_last"}).encode()
+            mock_http.post.return_value = mock_resp
+
+            uris = [f"spotify:track:{i:022d}" for i in range(250)]
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            resp = client.post("/api/add-tracks", json={"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": uris})
+
+            assert resp.status_code == 200
+            assert resp.json()["snapshot_id"] == "snapshot_last"
+            sent = [json.loads(c.kwargs["content"])["uris"] for c in mock_http.post.call_args_list]
+            assert [len(c) for c in sent] == [100, 100, 50]
+            assert sum(sent, []) == uris
+
+    def test_add_tracks_retries_after_rate_limit(self, monkeypatch):
+        """A 429 with Retry-After is retried after the advertised delay."""
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(api.asyncio, "sleep", fake_sleep)
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}):
+            mock_token.return_value = "test_access_token"
+
+            limited = Mock(is_success=False, status_code=429, headers={"Retry-After": "2"})
+            ok = Mock(is_success=True, status_code=201)
+            ok.content = json.dumps({"snapshot_id": "snap"}).encode()
+            mock_http.post.side_effect = [limited, ok]
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            resp = client.post(
+                "/api/add-tracks",
+                json={"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": ["spotify:track:4uLU6hMCjMI75M1A2tKUQC"]},
+            )
+
+            assert resp.status_code == 200
+            assert sleeps == [2.0]
+            assert mock_http.post.await_count == 2
+
     def test_add_tracks_rejects_empty_uris(self):
         """Test that adding tracks rejects empty URI list."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
@@ -178,16 +281,33 @@ class TestAddTracks:
             client.cookies.set("simrai_session", "test_session")
             resp = client.post(
                 "/api/add-tracks",
-                json={"playlist_id": "playlist_123", "uris": []}
+                json={"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": []}
             )
             
             assert resp.status_code == 400
             assert "No track URIs" in resp.json()["detail"]
 
+    def test_add_tracks_rejects_malformed_ids_without_calling_spotify(self):
+        """Bad playlist ids or URIs fail validation before any Spotify call."""
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}):
+            mock_token.return_value = "test_access_token"
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            for body in (
+                {"playlist_id": "../me", "uris": ["spotify:track:4uLU6hMCjMI75M1A2tKUQC"]},
+                {"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": ["spotify:album:4uLU6hMCjMI75M1A2tKUQC"]},
+                {"playlist_id": "37i9dQZF1DXcBWIGoYBM5M", "uris": ["not-a-uri"]},
+            ):
+                assert client.post("/api/add-tracks", json=body).status_code == 422
+            mock_http.post.assert_not_called()
+
     def test_add_tracks_handles_spotify_error(self):
         """Test that adding tracks handles Spotify API errors."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
@@ -202,7 +322,7 @@ class TestAddTracks:
             client.cookies.set("simrai_session", "test_session")
             resp = client.post(
                 "/api/add-tracks",
-                json={"playlist_id": "invalid_playlist", "uris": ["spotify:track:abc"]}
+                json={"playlist_id": "0000000000000000000000", "uris": ["spotify:track:4uLU6hMCjMI75M1A2tKUQC"]}
             )
             
             assert resp.status_code == 404
@@ -223,19 +343,19 @@ class TestSearchEndpoint:
     def test_search_success(self):
         """Test successful search."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
             mock_resp = Mock()
             mock_resp.is_success = True
-            mock_resp.json.return_value = {
+            mock_resp.content = json.dumps({
                 "tracks": {
                     "items": [
                         {"name": "Test Track", "artists": [{"name": "Test Artist"}]}
                     ]
                 }
-            }
+            }).encode()
             mock_http.get.return_value = mock_resp
             
             client = TestClient(app)
@@ -249,40 +369,60 @@ class TestSearchEndpoint:
             data = resp.json()
             assert "tracks" in data
             assert len(data["tracks"]["items"]) == 1
+            assert resp.headers["content-type"] == "application/json"
+
+    def test_search_revalidates_with_etag(self):
+        """A repeat search sends If-None-Match and serves the remembered body on 304."""
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}):
+            mock_token.return_value = "test_access_token"
+
+            first = Mock(status_code=200, is_success=True, headers={"etag": '"v1"'})
+            first.content = b'{"tracks": {"items": [{"name": "Cached Track"}]}}'
+            not_modified = Mock(status_code=304, is_success=False, headers={})
+            mock_http.get.side_effect = [first, not_modified]
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            body = {"query": "test", "type": "track", "limit": 5}
+            assert client.post("/api/search", json=body).status_code == 200
+            resp = client.post("/api/search", json=body)
+
+            assert resp.status_code == 200
+            assert resp.json()["tracks"]["items"][0]["name"] == "Cached Track"
+            assert mock_http.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
 
     def test_search_enforces_limit_bounds(self):
-        """Test that search enforces limit bounds (1-50)."""
+        """Test that search rejects limits outside Spotify's 1-50 range."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
             mock_resp = Mock()
             mock_resp.is_success = True
-            mock_resp.json.return_value = {"tracks": {"items": []}}
+            mock_resp.content = b'{"tracks": {"items": []}}'
             mock_http.get.return_value = mock_resp
             
             client = TestClient(app)
             client.cookies.set("simrai_session", "test_session")
             
-            # Test limit too high (should be capped at 50)
+            for limit in (100, 0):
+                resp = client.post(
+                    "/api/search",
+                    json={"query": "test", "type": "track", "limit": limit}
+                )
+                assert resp.status_code == 422
+            mock_http.get.assert_not_called()
+
             resp = client.post(
                 "/api/search",
-                json={"query": "test", "type": "track", "limit": 100}
+                json={"query": "test", "type": "track", "limit": 50}
             )
             assert resp.status_code == 200
-            # Verify limit was capped
             call_args = mock_http.get.call_args
             assert call_args[1]["params"]["limit"] == 50
-            
-            # Test limit too low (should be raised to 1)
-            resp = client.post(
-                "/api/search",
-                json={"query": "test", "type": "track", "limit": 0}
-            )
-            assert resp.status_code == 200
-            call_args = mock_http.get.call_args
-            assert call_args[1]["params"]["limit"] == 1
 
 
 class TestAdminPlaylistStats:
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from simrai import ratelimit as ratelimit_mod
+from simrai.ratelimit import TokenBucketLimiter
+
+
+def test_token_bucket_allows_burst_then_refills(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit_mod, "monotonic", lambda: now[0])
+
+    limiter = TokenBucketLimiter(per_minute=3)
+    assert [limiter.acquire("ip") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("ip") == 20.0  # one token per 20s at 3/minute
+    assert limiter.acquire("other") == 0.0  # buckets are per key
+
+    now[0] += 20
+    assert limiter.acquire("ip") == 0.0
+    assert limiter.acquire("ip") > 0
+
+
+def test_token_bucket_evicts_least_recently_seen_clients(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit_mod, "monotonic", lambda: now[0])
+
+    limiter = TokenBucketLimiter(per_minute=1, max_keys=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    assert limiter.acquire("a") > 0  # rejected requests also refresh recency
+    limiter.acquire("c")
+    assert list(limiter._buckets) == ["a", "c"]
+
+    # Rejected requests from new keys are bounded too.
+    assert limiter.acquire("c") > 0
+    limiter.acquire("d")
+    assert limiter.acquire("d") > 0
+    assert len(limiter._buckets) == 2
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict
 
@@ -14,9 +16,7 @@ class _DummyResponse:
         self.status_code = status_code
         self._json_data = json_data
         self.text = json.dumps(json_data)
-
-    def json(self) -> Dict[str, Any]:
-        return self._json_data
+        self.content = self.text.encode("utf-8")
 
     @property
     def is_success(self) -> bool:
@@ -103,6 +103,46 @@ def test_direct_spotify_client_uses_token_and_caches(monkeypatch) -> None:
     client.close()
 
 
+def test_direct_spotify_client_warmup_prefetches_token(monkeypatch) -> None:
+    cfg = SpotifyConfig(client_id="id", client_secret="secret")
+    client = DirectSpotifyClient(cfg)
+    monkeypatch.setattr(client, "_http", _DummyHTTPClient(), raising=True)
+
+    client.warmup()
+    assert client._token is not None
+    assert not client._token.is_expired
+
+
+def test_direct_spotify_client_fetches_one_token_for_concurrent_workers(monkeypatch) -> None:
+    """Threads sharing the client wait for a single token fetch instead of each making one."""
+    cfg = SpotifyConfig(client_id="id", client_secret="secret")
+    client = DirectSpotifyClient(cfg)
+    dummy_http = _DummyHTTPClient()
+    token_posts = []
+    real_post = dummy_http.post
+
+    def slow_post(url: str, **kwargs) -> _DummyResponse:
+        token_posts.append(url)
+        time.sleep(0.05)
+        return real_post(url, **kwargs)
+
+    monkeypatch.setattr(dummy_http, "post", slow_post)
+    monkeypatch.setattr(client, "_http", dummy_http, raising=True)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tokens = list(pool.map(lambda _: client._get_access_token(), range(8)))
+
+    assert tokens == ["dummy-access"] * 8
+    assert len(token_posts) == 1
+
+
+def test_direct_spotify_client_warmup_swallows_auth_errors() -> None:
+    client = DirectSpotifyClient(SpotifyConfig(client_id="", client_secret=""))
+    client.warmup()  # must not raise; the real request reports the error
+    assert client._token is None
+    client.close()
+
+
 def test_oauth_token_refresh_logic(monkeypatch, tmp_path: Path) -> None:
     """
     Verify that _get_user_access_token performs a refresh when the stored
@@ -115,4 +155,19 @@ def test_oauth_token_refresh_logic(monkeypatch, tmp_path: Path) -> None:
     assert tmp_path is not None
 
 
+def test_direct_spotify_client_caches_search_results(monkeypatch) -> None:
+    cfg = SpotifyConfig(client_id="id", client_secret="secret")
+    client = DirectSpotifyClient(cfg)
+    dummy_http = _DummyHTTPClient()
+    monkeypatch.setattr(client, "_http", dummy_http, raising=True)
+
+    first = client.search_tracks("rainy night", limit=5)
+    dummy_http.last_request = None
+    second = client.search_tracks("Rainy  Night", limit=5)
+
+    assert second == first
+    assert dummy_http.last_request is None  # served from cache, no HTTP call
+
+    client.search_tracks("rainy night", limit=10)
+    assert dummy_http.last_request is not None  # different limit is a different key
 
@@ -2,8 +2,10 @@
 Test suite for user profile operations: /api/me, /api/unlink-spotify.
 """
 
+import json
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from fastapi.testclient import TestClient
 
 from simrai import api
@@ -24,17 +26,17 @@ class TestUserProfile:
     def test_api_me_returns_user_profile(self):
         """Test successful user profile retrieval."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
             mock_resp = Mock()
             mock_resp.is_success = True
-            mock_resp.json.return_value = {
+            mock_resp.content = json.dumps({
                 "id": "test_user_123",
                 "display_name": "Test User",
                 "images": [{"url": "https://example.com/avatar.jpg"}]
-            }
+            }).encode()
             mock_http.get.return_value = mock_resp
             
             client = TestClient(app)
@@ -47,20 +49,46 @@ class TestUserProfile:
             assert data["display_name"] == "Test User"
             assert data["avatar_url"] == "https://example.com/avatar.jpg"
 
+    def test_api_me_and_create_playlist_share_cached_profile(self):
+        """/api/me then create-playlist for the same token hits Spotify /me once."""
+        with patch.object(api, '_get_user_access_token') as mock_token, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
+             patch.object(api, '_sessions', {"test_session": "test_user"}), \
+             patch.object(api, '_record_playlist_event'):
+            mock_token.return_value = "test_access_token"
+
+            mock_me_resp = Mock()
+            mock_me_resp.is_success = True
+            mock_me_resp.content = json.dumps({"id": "test_user_123", "display_name": "Test User", "images": []}).encode()
+            mock_pl_resp = Mock()
+            mock_pl_resp.is_success = True
+            mock_pl_resp.content = json.dumps({"id": "playlist_1", "external_urls": {}}).encode()
+            mock_http.get.return_value = mock_me_resp
+            mock_http.post.return_value = mock_pl_resp
+
+            client = TestClient(app)
+            client.cookies.set("simrai_session", "test_session")
+            assert client.get("/api/me").json()["id"] == "test_user_123"
+            assert client.get("/api/me").status_code == 200
+            assert client.post("/api/create-playlist", json={"name": "Mix"}).status_code == 200
+
+            assert mock_http.get.await_count == 1
+            assert "/users/test_user_123/playlists" in mock_http.post.call_args[0][0]
+
     def test_api_me_handles_missing_avatar(self):
         """Test that /api/me handles missing avatar gracefully."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
             mock_resp = Mock()
             mock_resp.is_success = True
-            mock_resp.json.return_value = {
+            mock_resp.content = json.dumps({
                 "id": "test_user_123",
                 "display_name": "Test User",
                 "images": []
-            }
+            }).encode()
             mock_http.get.return_value = mock_resp
             
             client = TestClient(app)
@@ -74,7 +102,7 @@ class TestUserProfile:
     def test_api_me_handles_spotify_error(self):
         """Test that /api/me handles Spotify API errors."""
         with patch.object(api, '_get_user_access_token') as mock_token, \
-             patch.object(api, '_oauth_http') as mock_http, \
+             patch.object(api, '_oauth_http', new_callable=AsyncMock) as mock_http, \
              patch.object(api, '_sessions', {"test_session": "test_user"}):
             mock_token.return_value = "test_access_token"
             
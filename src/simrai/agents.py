@@ -16,6 +16,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+from .mood import MoodInterpretation
 from .pipeline import QueueResult, generate_queue
 
 
@@ -50,15 +51,24 @@ def run_with_agents(
     intense: bool = False,
     soft: bool = False,
     crew: object | None = None,  # kept only for signature compatibility
+    mood_override: MoodInterpretation | None = None,
 ) -> QueueResult:
     """
     Backwards-compatible wrapper that simply delegates to `generate_queue`.
 
     Parameters mirror the old agent entrypoint so callers don't break, but
-    internally this just runs the standard metadata-first pipeline.
+    internally this just runs the standard metadata-first pipeline. A
+    pre-computed `mood_override` is threaded through explicitly rather than
+    by patching `simrai.mood.interpret_mood`.
     """
 
-    return generate_queue(mood_text, length=length, intense=intense, soft=soft)
+    return generate_queue(
+        mood_text,
+        length=length,
+        intense=intense,
+        soft=soft,
+        mood_override=mood_override,
+    )
 
 
 __all__ = ["AgentConfig", "is_ai_available", "run_with_agents"]
@@ -31,31 +31,65 @@ Exposes a simple JSON API:
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import functools
+import html
 import logging
 import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from string import Template
+from typing import Annotated, Any, AsyncIterator, List, Optional
+from urllib.parse import urlencode
 
 import httpx
-from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
-from pydantic import BaseModel
-import secrets
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-
-from .config import load_config, get_default_config_dir
-from .pipeline import QueueResult, QueueTrack, generate_queue
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+from . import __version__
+from .cache import TTLCache
+from .config import load_config, get_default_config_dir, setup_logging
+from .mood import close_groq_client, groq_configured
+from .pipeline import QueueResult, QueueTrack, close_spotify_service, generate_queue
+from .pipeline import warmup as warmup_pipeline
+from .ratelimit import TokenBucketLimiter
 from .spotify import SpotifyError
 
 logger = logging.getLogger(__name__)
 
-# Rate limiter to prevent hitting Spotify/Groq API limits
-limiter = Limiter(key_func=get_remote_address)
+# Per-IP rate limits that keep clients from exhausting the Spotify/Groq budgets.
+# Every limiter is registered here so tests (and admins) can reset them together.
+_rate_limiters: list[TokenBucketLimiter] = []
+
+
+def _rate_limit(per_minute: int) -> Any:
+    """Route dependency allowing ``per_minute`` requests per client IP (burst + refill)."""
+    limiter = TokenBucketLimiter(per_minute)
+    _rate_limiters.append(limiter)
+
+    async def check(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        retry_after = limiter.acquire(client_ip)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: {per_minute} per 1 minute",
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+    return Depends(check)
+
 
 # Optional Neon/PostgreSQL stats database for playlist tracking
 STATS_DB_URL = os.getenv("SIMRAI_STATS_DATABASE_URL")
@@ -66,17 +100,55 @@ try:  # pragma: no cover - import guarding
 except Exception:  # pragma: no cover - if driver missing, we degrade gracefully
     psycopg = None  # type: ignore
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (FastAPI's bundled variant is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def _warmup_backends() -> None:
+    try:
+        warmup_pipeline()
+        logger.info("Groq/Spotify warmup complete")
+    except Exception as exc:  # pragma: no cover - warmup is best-effort
+        logger.warning("Startup warmup failed: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Build the Groq client and fetch a Spotify token at startup so the first
+    # /queue does not pay for them. Runs in the background so startup (and the
+    # platform health check) is not held up by slow upstreams.
+    global _oauth_http, _queue_executor
+    setup_logging()
+    if isinstance(_oauth_http, httpx.AsyncClient) and _oauth_http.is_closed:
+        # Re-entered after a previous shutdown in the same process (reloads, tests).
+        _oauth_http = _new_oauth_http()
+
+    warmup_task = asyncio.create_task(asyncio.to_thread(_warmup_backends))
+    try:
+        yield
+    finally:
+        if not warmup_task.done():
+            warmup_task.cancel()
+        # Queued-but-unstarted pipeline runs are dropped; running ones finish on their own.
+        executor, _queue_executor = _queue_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        close_spotify_service()
+        close_groq_client()
+        await _oauth_http.aclose()
+
+
 app = FastAPI(
     title="SIMRAI API",
     description="SIMRAI – Spotify-Induced Music Recommendation AI (metadata-only, read-only).",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Add rate limit handler and middleware
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
-
 # Allow local web frontends (e.g. React dev server on localhost:5658) and the hosted
 # Render static site (https://simrai.onrender.com) to call the API.
 # Credentials enabled for session cookies.
@@ -88,15 +160,46 @@ app.add_middleware(
         "https://simrai.onrender.com",
     ],
     allow_credentials=True,  # Required for cookies
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (only what the routes and web UI use) avoid echoing arbitrary
+    # request headers back, and max_age lets browsers cache preflights for a day.
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "X-Simrai-Session", "X-Admin-Token"],
+    max_age=86400,
 )
 
+# Search results and longer queues are tens of KB of JSON; compress anything over
+# 1 KB for clients that accept gzip. Small bodies are sent as-is.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Opt-in request profiling for perf work: with SIMRAI_PROFILE=1 (and the
+# "profile" extra installed), add ?profile=1 to any request to get a pyinstrument
+# HTML report of it instead of the normal response. Never enable in production.
+if os.getenv("SIMRAI_PROFILE", "").lower() in {"1", "true", "yes"}:
+    from pyinstrument import Profiler
+
+    @app.middleware("http")
+    async def _profile_request(request: Request, call_next: Any) -> Response:
+        if not request.query_params.get("profile"):
+            return await call_next(request)
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        await call_next(request)
+        profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
+
+# Request bodies are read-only once parsed, and no client field legitimately needs
+# more than 1 KB of text; longer strings are rejected by the validator up front.
+_REQUEST_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore", str_max_length=1024)
+
 
 class QueueRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     mood: str
-    length: int = 12
-    duration_minutes: Optional[int] = None
+    # Bounded here so oversized requests are rejected (422) before any pipeline work.
+    length: int = Field(12, ge=1, le=50)
+    duration_minutes: Optional[int] = Field(None, ge=1, le=180)
     intense: bool = False
     soft: bool = False
 
@@ -128,9 +231,66 @@ def health() -> dict:
     return {"status": "ok"}
 
 
-@limiter.limit("10/minute")  # Max 10 queue generations per minute per IP
-@app.post("/queue", response_model=QueueResponse, tags=["queue"])
-def create_queue(body: QueueRequest, request: Request) -> QueueResponse:
+# In-flight queue generations keyed by request parameters. Identical requests that
+# arrive while one is running (retry clicks, several tabs) await the same task
+# instead of each hitting Groq and Spotify.
+_inflight_queues: dict[tuple, "asyncio.Future[QueueResult]"] = {}
+# Pipeline runs get their own bounded pool: each run fans out to Groq and several
+# Spotify searches, and sharing asyncio's default executor would let a burst of
+# /queue requests starve the small to_thread jobs other handlers depend on.
+_QUEUE_WORKERS = max(1, int(os.getenv("SIMRAI_QUEUE_WORKERS", "8")))
+
+# Built on first use; the lifespan shuts it down and drops it on exit.
+_queue_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_queue_executor() -> ThreadPoolExecutor:
+    global _queue_executor
+    if _queue_executor is None:
+        _queue_executor = ThreadPoolExecutor(max_workers=_QUEUE_WORKERS, thread_name_prefix="simrai-queue")
+    return _queue_executor
+
+
+# Encoded /queue bodies for recently answered requests. The pipeline is deterministic
+# for a given request apart from Spotify's catalogue changing, so a short TTL is safe.
+_QUEUE_CACHE_TTL_SECONDS = 600
+_queue_responses: TTLCache[bytes] = TTLCache(maxsize=256, ttl=_QUEUE_CACHE_TTL_SECONDS)
+
+
+def _queue_key(body: QueueRequest) -> tuple:
+    # When duration_minutes is provided, length is ignored to keep the two independent.
+    if body.duration_minutes and body.duration_minutes > 0:
+        return (body.mood, None, body.duration_minutes, body.intense, body.soft)
+    return (body.mood, body.length, None, body.intense, body.soft)
+
+
+async def _generate_queue_coalesced(body: QueueRequest) -> QueueResult:
+    # generate_queue automatically tries AI if available, falls back to rule-based.
+    # It is blocking (Groq + Spotify I/O), so it runs in a worker thread to keep
+    # the event loop free for other requests.
+    key = _queue_key(body)
+    if key[2] is not None:
+        kwargs = {"duration_minutes": body.duration_minutes}
+    else:
+        kwargs = {"length": body.length}
+
+    task = _inflight_queues.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().run_in_executor(
+            _get_queue_executor(),
+            functools.partial(generate_queue, body.mood, intense=body.intense, soft=body.soft, **kwargs),
+        )
+        _inflight_queues[key] = task
+        task.add_done_callback(lambda _t: _inflight_queues.pop(key, None))
+    else:
+        logger.info("Joining in-flight queue generation for mood=%r", body.mood)
+    # Shield so one client disconnecting does not cancel the work others are awaiting.
+    return await asyncio.shield(task)
+
+
+# Max 10 queue generations per minute per IP
+@app.post("/queue", response_model=QueueResponse, tags=["queue"], dependencies=[_rate_limit(10)])
+async def create_queue(body: QueueRequest, request: Request) -> Response:
     logger.info(
         "API queue request: mood=%r, length=%s, duration=%s, intense=%s, soft=%s",
         body.mood,
@@ -139,94 +299,150 @@ def create_queue(body: QueueRequest, request: Request) -> QueueResponse:
         body.intense,
         body.soft,
     )
+    key = _queue_key(body)
+    cached = _queue_responses.get(key)
+    if cached is not None:
+        logger.info("Serving cached queue for mood=%r", body.mood)
+        return Response(content=cached, media_type="application/json")
+
     try:
-        # generate_queue automatically tries AI if available, falls back to rule-based
-        # When duration_minutes is provided, don't pass length to ensure independence
-        if body.duration_minutes and body.duration_minutes > 0:
-            result: QueueResult = generate_queue(
-                body.mood,
-                duration_minutes=body.duration_minutes,
-                intense=body.intense,
-                soft=body.soft,
-            )
-        else:
-            result: QueueResult = generate_queue(
-                body.mood,
-                length=body.length,
-                intense=body.intense,
-                soft=body.soft,
-            )
-        logger.info(f"API queue generated: {len(result.tracks)} tracks")
+        result = await _generate_queue_coalesced(body)
+        logger.info("API queue generated: %s tracks", len(result.tracks))
     except SpotifyError as exc:
-        logger.error(f"Spotify error in API queue endpoint: {exc}")
+        logger.error("Spotify error in API queue endpoint: %s", exc)
         raise HTTPException(status_code=502, detail=f"Spotify error: {exc}") from exc
     except Exception as exc:  # pragma: no cover - safety net
-        logger.exception(f"Internal error in API queue endpoint: {exc}")
+        logger.exception("Internal error in API queue endpoint: %s", exc)
         raise HTTPException(status_code=500, detail=f"Internal error: {exc}") from exc
 
     if not result.tracks:
-        logger.warning(f"No tracks found for API queue request: mood={body.mood!r}")
+        logger.warning("No tracks found for API queue request: mood=%r", body.mood)
         # Return 200 with empty list; the client can decide what to do.
-        return QueueResponse(
-            mood=result.mood_text,
-            mood_vector=MoodVectorOut(
-                valence=result.mood_vector.valence,
-                energy=result.mood_vector.energy,
-            ),
-            summary=result.summary,
-            tracks=[],
-        )
 
-    tracks: List[QueueTrackOut] = [
-        QueueTrackOut(
-            name=t.name,
-            artists=t.artists,
-            uri=t.uri,
-            valence=t.valence,
-            energy=t.energy,
-            duration_ms=t.duration_ms,
-        )
-        for t in result.tracks
-    ]
-
-    return QueueResponse(
-        mood=result.mood_text,
-        mood_vector=MoodVectorOut(
-            valence=result.mood_vector.valence,
-            energy=result.mood_vector.energy,
-        ),
-        summary=result.summary,
-        tracks=tracks,
+    # Build the body as plain dicts and encode with orjson directly: the data comes
+    # from our own pipeline, so per-track Pydantic validation would be wasted work.
+    # QueueResponse stays as the response_model for the OpenAPI schema.
+    response = ORJSONResponse(
+        {
+            "mood": result.mood_text,
+            "mood_vector": {
+                "valence": result.mood_vector.valence,
+                "energy": result.mood_vector.energy,
+            },
+            "summary": result.summary,
+            "tracks": [
+                {
+                    "name": t.name,
+                    "artists": t.artists,
+                    "uri": t.uri,
+                    "valence": t.valence,
+                    "energy": t.energy,
+                    "duration_ms": t.duration_ms,
+                }
+                for t in result.tracks
+            ],
+        }
     )
+    # A rule-based fallback (Groq over budget or timed out) is not cached, so the
+    # next request gets the refined queue once Groq answers again.
+    if result.tracks and (result.from_groq or not groq_configured()):
+        _queue_responses.set(key, bytes(response.body))
+    return response
 
 
 SPOTIFY_AUTHORIZE_URL = "https://accounts.spotify.com/authorize"
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 SPOTIFY_API_BASE_URL = "https://api.spotify.com/v1"
+# Fixed endpoints parsed once rather than on every request.
+_SPOTIFY_ME_URL = httpx.URL(f"{SPOTIFY_API_BASE_URL}/me")
+_SPOTIFY_SEARCH_URL = httpx.URL(f"{SPOTIFY_API_BASE_URL}/search")
+
+def _json_body(resp: httpx.Response) -> Any:
+    """Decode a Spotify JSON response body (orjson is faster than httpx's stdlib decode)."""
+    return orjson.loads(resp.content)
+
+
+# Sent with every Spotify call; set once on the shared client instead of per request.
+_SPOTIFY_DEFAULT_HEADERS = {
+    "User-Agent": f"simrai/{__version__}",
+    "Accept-Encoding": "gzip",
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _spotify_basic_auth(client_id: str, client_secret: str) -> dict[str, str]:
+    """Authorization header for the token endpoint, encoded once per credential pair."""
+    encoded = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    return {"Authorization": f"Basic {encoded}"}
+
+
+def _new_oauth_http() -> httpx.AsyncClient:
+    # HTTP/2 with a keep-alive pool: back-to-back Spotify calls (e.g. /me then
+    # create playlist) reuse one TLS session and can multiplex over it.
+    return httpx.AsyncClient(
+        http2=True,
+        headers=_SPOTIFY_DEFAULT_HEADERS,
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=100,
+            keepalive_expiry=60.0,
+        ),
+    )
 
-_oauth_http = httpx.Client(timeout=10.0)
+
+# One async client for all user-facing Spotify calls, shared for the app's lifetime
+# and closed in the lifespan handler.
+_oauth_http = _new_oauth_http()
 _cfg = load_config()
 _config_dir = get_default_config_dir()
 _tokens_dir = _config_dir / "spotify_tokens"  # Directory for per-user tokens
-_oauth_states: dict[str, float] = {}  # state -> timestamp (for expiry cleanup)
-_sessions: dict[str, str] = {}  # session_id -> user_id mapping
+# Pending OAuth states -> monotonic deadline. Every state gets the same TTL, so
+# insertion order is expiry order and sweeping only touches expired entries.
+_oauth_states: "OrderedDict[str, float]" = OrderedDict()
+_OAUTH_STATE_TTL_SECONDS = 600
+# session_id -> user_id. Bounded and expiring with the session cookie; an evicted
+# session is transparently recovered from the token store on its next request.
+_SESSION_TTL_SECONDS = 86400 * 30
+_sessions: TTLCache[str] = TTLCache(maxsize=100_000, ttl=_SESSION_TTL_SECONDS)
+# Parsed token files by user_id, so protected requests skip disk reads. The token
+# files stay the source of truth across restarts; this process is their only writer.
+_token_cache: dict[str, dict] = {}
+_refresh_locks: dict[str, asyncio.Lock] = {}  # user_id -> lock serializing an in-progress refresh
+_refresh_waiters: dict[str, int] = {}  # user_id -> requests holding or queued on that lock
+# Spotify /me profile per access token (tokens live ~1h, so entries expire with them).
+_spotify_profiles: TTLCache[dict] = TTLCache(maxsize=1024, ttl=3600)
+# (url, params, token) -> (ETag, body) of the last successful GET, for If-None-Match.
+_etag_bodies: TTLCache[tuple[str, bytes]] = TTLCache(maxsize=512, ttl=3600)
 
 
 class SearchRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     query: str
     type: str = "track"
-    limit: int = 20
+    limit: int = Field(20, ge=1, le=50)  # Spotify's maximum page size
 
 
 class CreatePlaylistRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     name: Optional[str] = None
     description: Optional[str] = None
     public: bool = False
 
 
+# Spotify ids are 22 base62 characters; playlists accept track and episode URIs.
+_SpotifyId = Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9]{22}$")]
+_PlayableUri = Annotated[str, StringConstraints(pattern=r"^spotify:(?:track|episode):[A-Za-z0-9]{22}$")]
+
+
 class AddTracksRequest(BaseModel):
-    playlist_id: str
-    uris: List[str]
+    model_config = _REQUEST_MODEL_CONFIG
+
+    # Malformed ids are rejected (422) here instead of after a Spotify round-trip.
+    playlist_id: _SpotifyId
+    uris: List[_PlayableUri] = Field(max_length=10_000)  # Spotify's playlist size limit
 
 
 class SpotifyUserOut(BaseModel):
@@ -250,41 +466,57 @@ class PlaylistStatsOut(BaseModel):
     playlists: List[PlaylistEventOut]
 
 
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]")
+
 
 def _get_token_path(user_id: str) -> Path:
     """Get the token file path for a specific user."""
-    _tokens_dir.mkdir(parents=True, exist_ok=True)
-    # Use user_id as filename (sanitized)
-    safe_user_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in user_id)
-    return _tokens_dir / f"{safe_user_id}.json"
+    # Use user_id as filename (sanitized). The directory is created by _save_tokens,
+    # the only writer, so lookups do not pay for a mkdir.
+    return _tokens_dir / f"{_UNSAFE_FILENAME_CHARS.sub('_', user_id)}.json"
 
 
 def _load_tokens(user_id: str) -> Optional[dict]:
-    """Load tokens for a specific user."""
-    token_path = _get_token_path(user_id)
-    if not token_path.exists():
-        return None
-    try:
-        import json
+    """
+    Load tokens for a specific user.
+
+    Served from the in-process cache when possible; disk is only read on the first
+    lookup for a user (e.g. after a restart).
+    """
+    cached = _token_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
 
-        with token_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+    try:
+        tokens = orjson.loads(_get_token_path(user_id).read_bytes())
+    except Exception:  # Missing or unreadable token file
         return None
+    _token_cache[user_id] = tokens
+    return dict(tokens)
 
 
 def _save_tokens(user_id: str, data: dict) -> None:
-    """Save tokens for a specific user."""
-    import json
+    """
+    Save tokens for a specific user (disk + in-process cache).
+
+    The file is written to a temp sibling and renamed into place so a crash
+    mid-write never leaves a truncated token file. Saving tokens identical to
+    the ones already persisted is a no-op.
+    """
+    if _token_cache.get(user_id) == data:
+        return
 
     token_path = _get_token_path(user_id)
     _tokens_dir.mkdir(parents=True, exist_ok=True)
-    with token_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f)
+    tmp_path = token_path.with_suffix(".tmp")
+    tmp_path.write_bytes(orjson.dumps(data))
+    tmp_path.replace(token_path)
+    _token_cache[user_id] = dict(data)
 
 
 def _delete_tokens(user_id: str) -> None:
     """Delete tokens for a specific user."""
+    _token_cache.pop(user_id, None)
     token_path = _get_token_path(user_id)
     try:
         token_path.unlink()
@@ -377,15 +609,16 @@ def _get_session_user_id(request: Request) -> str:
         )
 
     # Primary path: in-memory session map (current process)
-    if session_id in _sessions:
-        return _sessions[session_id]
+    user_id = _sessions.get(session_id)
+    if user_id is not None:
+        return user_id
 
     # Fallback: treat cookie value as user_id and verify tokens exist on disk.
     # This makes sessions resilient across restarts when tokens are persisted.
     tokens = _load_tokens(session_id)
     if tokens:
         user_id = tokens.get("user_id") or session_id
-        logger.info(f"Recovered session for user {user_id!r} from token store (direct match)")
+        logger.info("Recovered session for user %r from token store (direct match)", user_id)
         _sessions[session_id] = user_id
         return user_id
 
@@ -394,10 +627,7 @@ def _get_session_user_id(request: Request) -> str:
         if _tokens_dir.exists():
             for path in _tokens_dir.glob("*.json"):
                 try:
-                    import json
-
-                    with path.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = orjson.loads(path.read_bytes())
                 except Exception:  # pragma: no cover - corrupted file, skip
                     continue
                 file_user_id = data.get("user_id") or path.stem
@@ -419,18 +649,16 @@ def _get_session_user_id(request: Request) -> str:
     )
 
 
-def _get_user_access_token(user_id: str) -> str:
+async def _get_user_access_token(user_id: str) -> str:
     """
     Return a valid user access token for a specific user, refreshing if needed.
 
     This keeps tokens on disk under the user's config dir and never exposes
     them to the frontend. Supports multiple concurrent users.
     """
-    import time
-
     tokens = _load_tokens(user_id)
     if not tokens:
-        logger.warning(f"User access token requested for {user_id} but no tokens found")
+        logger.warning("User access token requested for %s but no tokens found", user_id)
         raise HTTPException(status_code=401, detail="Spotify is not connected. Visit /auth/login.")
 
     access_token = tokens.get("access_token")
@@ -438,40 +666,67 @@ def _get_user_access_token(user_id: str) -> str:
     refresh_token = tokens.get("refresh_token")
 
     if not access_token or not expires_at or not refresh_token:
-        logger.warning(f"User access token requested for {user_id} but tokens are invalid")
+        logger.warning("User access token requested for %s but tokens are invalid", user_id)
         raise HTTPException(status_code=401, detail="Spotify tokens are invalid. Reconnect via /auth/login.")
 
     if time.time() < float(expires_at) - 10:
-        logger.debug(f"Using cached access token for {user_id}")
+        logger.debug("Using cached access token for %s", user_id)
         return access_token
 
-    # Refresh
-    logger.info(f"Refreshing expired access token for {user_id}")
+    # Only one refresh per user runs at a time. Requests that queued behind it
+    # re-check the cached tokens and reuse the freshly minted access token.
+    lock = _refresh_locks.get(user_id) or _refresh_locks.setdefault(user_id, asyncio.Lock())
+    _refresh_waiters[user_id] = _refresh_waiters.get(user_id, 0) + 1
+    try:
+        async with lock:
+            tokens = _load_tokens(user_id) or tokens
+            expires_at = tokens.get("expires_at")
+            if expires_at and time.time() < float(expires_at) - 10:
+                logger.debug("Access token for %s was refreshed by a concurrent request", user_id)
+                return tokens["access_token"]
+            return await _refresh_user_access_token(user_id, tokens)
+    finally:
+        # Keep the dicts bounded by users refreshing right now. The lock is dropped
+        # only once no request holds or waits on it (locked() alone turns False
+        # before a woken waiter runs), so every refresh for a user stays serialized.
+        remaining = _refresh_waiters[user_id] - 1
+        if remaining:
+            _refresh_waiters[user_id] = remaining
+        else:
+            del _refresh_waiters[user_id]
+            del _refresh_locks[user_id]
+
+
+async def _refresh_user_access_token(user_id: str, tokens: dict) -> str:
+    """Exchange the user's refresh token for a new access token and persist it."""
+    refresh_token = tokens.get("refresh_token")
+
+    logger.info("Refreshing expired access token for %s", user_id)
     if not _cfg.spotify.client_id or not _cfg.spotify.client_secret:
         logger.error("Cannot refresh token: client ID/secret missing")
         raise HTTPException(status_code=500, detail="Spotify client ID/secret missing for refresh.")
 
     try:
-        resp = _oauth_http.post(
+        resp = await _oauth_http.post(
             SPOTIFY_TOKEN_URL,
             data={
                 "grant_type": "refresh_token",
                 "refresh_token": refresh_token,
             },
-            auth=(_cfg.spotify.client_id, _cfg.spotify.client_secret),
+            headers=_spotify_basic_auth(_cfg.spotify.client_id, _cfg.spotify.client_secret),
         )
     except httpx.HTTPError as exc:
-        logger.error(f"Failed to contact Spotify token endpoint for refresh: {exc}")
+        logger.error("Failed to contact Spotify token endpoint for refresh: %s", exc)
         raise HTTPException(status_code=502, detail=f"Failed to contact Spotify token endpoint: {exc}") from exc
 
     if resp.status_code != 200:
-        logger.error(f"Spotify token refresh failed: {resp.status_code} {resp.text}")
+        logger.error("Spotify token refresh failed: %s %s", resp.status_code, resp.text)
         raise HTTPException(
             status_code=502,
             detail=f"Spotify token refresh failed: {resp.status_code} {resp.text}",
         )
 
-    data = resp.json()
+    data = _json_body(resp)
     new_access_token = data.get("access_token")
     expires_in = int(data.get("expires_in", 3600))
 
@@ -479,15 +734,81 @@ def _get_user_access_token(user_id: str) -> str:
         logger.error("Spotify token refresh response missing access_token")
         raise HTTPException(status_code=502, detail="Spotify token refresh response missing access_token.")
 
-    import time as _t
-
     tokens["access_token"] = new_access_token
-    tokens["expires_at"] = _t.time() + expires_in
+    tokens["expires_at"] = time.time() + expires_in
     _save_tokens(user_id, tokens)
-    logger.info(f"Access token refreshed successfully for {user_id}")
+    logger.info("Access token refreshed successfully for %s", user_id)
     return new_access_token
 
 
+async def _get_spotify_profile(token: str) -> dict:
+    """
+    Return the Spotify /me profile for an access token, calling Spotify only on a cache miss.
+
+    The profile behind a token does not change, so /api/me and playlist creation
+    share one lookup per token instead of one per request.
+    """
+    cached = _spotify_profiles.get(token)
+    if cached is not None:
+        return cached
+
+    try:
+        resp = await _oauth_http.get(
+            _SPOTIFY_ME_URL,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    except httpx.HTTPError as exc:
+        logger.error("Error calling Spotify /me API: %s", exc)
+        raise HTTPException(status_code=502, detail=f"Error calling Spotify /me: {exc}") from exc
+
+    if not resp.is_success:
+        logger.error("Spotify /me API error: %s %s", resp.status_code, resp.text)
+        raise HTTPException(
+            status_code=resp.status_code,
+            detail=f"Spotify /me error: {resp.text}",
+        )
+
+    profile = _json_body(resp)
+    _spotify_profiles.set(token, profile)
+    return profile
+
+
+async def _conditional_get(url: httpx.URL | str, token: str, params: Optional[dict] = None) -> httpx.Response:
+    """
+    GET a Spotify resource, revalidating the last body seen for it with If-None-Match.
+
+    A 304 is turned back into a 200 carrying the remembered body, so callers handle
+    one response shape while the unchanged payload is not re-sent over the wire.
+    """
+    key = (url, tuple(sorted(params.items())) if params else (), token)
+    headers = {"Authorization": f"Bearer {token}"}
+    remembered = _etag_bodies.get(key)
+    if remembered is not None:
+        headers["If-None-Match"] = remembered[0]
+
+    resp = await _oauth_http.get(url, params=params, headers=headers)
+    if resp.status_code == 304 and remembered is not None:
+        return httpx.Response(200, content=remembered[1], headers={"Content-Type": "application/json"})
+
+    etag = resp.headers.get("etag")
+    if etag and resp.is_success:
+        _etag_bodies.set(key, (etag, resp.content))
+    return resp
+
+
+@functools.lru_cache(maxsize=4)
+def _authorize_url_prefix(client_id: str, redirect_uri: str) -> str:
+    """Spotify authorize URL with every parameter except the per-login ``state``."""
+    params = {
+        "client_id": client_id,
+        "response_type": "code",
+        "redirect_uri": redirect_uri,
+        "scope": "playlist-modify-private playlist-modify-public",
+        "show_dialog": "true",  # Force consent screen + account picker every time
+    }
+    return f"{SPOTIFY_AUTHORIZE_URL}?{urlencode(params)}"
+
+
 @app.get("/auth/login", tags=["auth"])
 def auth_login() -> RedirectResponse:
     """
@@ -496,10 +817,6 @@ def auth_login() -> RedirectResponse:
     This is designed for local use: visit http://127.0.0.1:8000/auth/login
     in your browser, approve the app, and then come back to SIMRAI.
     """
-    from urllib.parse import urlencode
-    import secrets
-    import time
-
     logger.info("OAuth login initiated")
     client_id = _cfg.spotify.client_id
     # Redirect URI is managed in the Spotify Developer dashboard; SIMRAI always
@@ -517,32 +834,146 @@ def auth_login() -> RedirectResponse:
 
     # Generate unique state for this OAuth flow (prevents race conditions)
     state = secrets.token_urlsafe(32)
-    _oauth_states[state] = time.time()
-    
-    # Clean up expired states (older than 10 minutes)
-    current_time = time.time()
-    expired_states = [s for s, t in _oauth_states.items() if current_time - t > 600]
-    for s in expired_states:
-        del _oauth_states[s]
-    
-    scopes = "playlist-modify-private playlist-modify-public"
-    logger.debug(f"OAuth state generated: {state[:8]}..., redirect_uri={redirect_uri}")
 
-    params = {
-        "client_id": client_id,
-        "response_type": "code",
-        "redirect_uri": redirect_uri,
-        "scope": scopes,
-        "state": state,
-        "show_dialog": "true",  # Force consent screen + account picker every time
-    }
-    url = f"{SPOTIFY_AUTHORIZE_URL}?{urlencode(params)}"
+    # Drop expired states (older than 10 minutes) from the front of the queue.
+    now = time.monotonic()
+    while _oauth_states and next(iter(_oauth_states.values())) < now:
+        _oauth_states.popitem(last=False)
+    _oauth_states[state] = now + _OAUTH_STATE_TTL_SECONDS
+
+    logger.debug("OAuth state generated: %s..., redirect_uri=%s", state[:8], redirect_uri)
+
+    # token_urlsafe output needs no percent-encoding, so it is appended as-is.
+    url = f"{_authorize_url_prefix(client_id, redirect_uri)}&state={state}"
     logger.info("Redirecting to Spotify authorization page with explicit consent")
     return RedirectResponse(url, status_code=302)
 
 
+# Pages rendered into the OAuth popup by /auth/callback. They share one layout;
+# pages without per-request data are rendered and encoded once at import time.
+_CALLBACK_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8" />
+    <title>SIMRAI – $title</title>
+    <style>
+      body {
+        font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+        padding: 1.5rem;
+        background: #1e1e1e;
+        color: #cccccc;
+        text-align: center;
+      }
+      h1 { color: $accent; }
+    </style>
+  </head>
+  <body>
+    <h1>$heading</h1>
+    $body
+    <script>
+      $script
+    </script>
+  </body>
+</html>
+""")
+_ERROR_ACCENT = "#f48771"
+_SUCCESS_ACCENT = "#4ec9b0"
+_CLOSE_SCRIPT = "setTimeout(function () { window.close(); }, 2000);"
+
+
+def _render_callback_page(
+    title: str,
+    heading: str,
+    body: str,
+    *,
+    accent: str = _ERROR_ACCENT,
+    script: str = _CLOSE_SCRIPT,
+) -> str:
+    """Fill the callback layout; ``body`` and ``script`` must already be escaped."""
+    return _CALLBACK_PAGE.substitute(title=title, heading=heading, body=body, accent=accent, script=script)
+
+
+def _js_string(value: str) -> str:
+    """JSON-encode ``value`` for a <script> block, escaping "<" so it cannot close the tag."""
+    return orjson.dumps(value).decode().replace("<", "\\u003c")
+
+
+def _muted(text: str) -> str:
+    return f'<p style="color: #858585; font-size: 0.9em;">{html.escape(text)}</p>'
+
+
+_HTML_NO_CODE: bytes = _render_callback_page(
+    "Connection Error",
+    "Connection Error",
+    "<p>No authorization code received. Please try again.</p>",
+).encode()
+_HTML_BAD_STATE: bytes = _render_callback_page(
+    "Security Error",
+    "Security Error",
+    "<p>Invalid OAuth state. Please try connecting again.</p>",
+).encode()
+_HTML_MISSING_TOKENS: bytes = _render_callback_page(
+    "Connection Error",
+    "Connection Error",
+    "<p>Spotify response missing required tokens.</p>",
+).encode()
+
+
+def _html_denied(error: str, error_msg: str) -> str:
+    script = (
+        "try {\n"
+        "        if (window.opener) {\n"
+        "          window.opener.postMessage("
+        f'{{ type: "simrai-spotify-denied", error: {_js_string(error)} }}, "*");\n'
+        "        }\n"
+        f"        {_CLOSE_SCRIPT}\n"
+        "      } catch (e) {\n"
+        "        // ignore\n"
+        "      }"
+    )
+    return _render_callback_page(
+        "Connection Denied",
+        "Connection Denied",
+        "<p>You chose not to connect your Spotify account.</p>\n    " + _muted(error_msg),
+        script=script,
+    )
+
+
+def _html_exchange_failed(status_code: int) -> str:
+    return _render_callback_page(
+        "Connection Error",
+        "Connection Error",
+        "<p>Failed to exchange authorization code for tokens.</p>\n    " + _muted(f"Status: {status_code}"),
+    )
+
+
+def _html_connected(session_id: str) -> str:
+    script = (
+        "try {\n"
+        "        if (window.opener) {\n"
+        "          window.opener.postMessage(\n"
+        f'            {{ type: "simrai-spotify-connected", sessionId: {_js_string(session_id)} }},\n'
+        '            "*"\n'
+        "          );\n"
+        "        }\n"
+        "        // Give the opener a moment to process, then close.\n"
+        "        setTimeout(function () { window.close(); }, 1500);\n"
+        "      } catch (e) {\n"
+        "        // ignore\n"
+        "      }"
+    )
+    return _render_callback_page(
+        "Spotify Connected",
+        "Spotify Connected ✅",
+        "<p>Your Spotify account has been connected successfully.</p>\n    "
+        + _muted("You can close this window and return to SIMRAI."),
+        accent=_SUCCESS_ACCENT,
+        script=script,
+    )
+
+
 @app.get("/auth/callback", tags=["auth"])
-def auth_callback(
+async def auth_callback(
     request: Request,
     code: Optional[str] = Query(None),
     state: Optional[str] = Query(None),
@@ -554,114 +985,26 @@ def auth_callback(
 
     Only connects if the user explicitly approved. If denied, shows an error message.
     """
-    global _last_oauth_state
-
     # Check if user denied access
     if error:
         error_msg = error_description or error
-        logger.warning(f"OAuth callback: user denied access - {error_msg}")
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-          <head>
-            <meta charset="utf-8" />
-            <title>SIMRAI – Connection Denied</title>
-            <style>
-              body {{
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                padding: 1.5rem;
-                background: #1e1e1e;
-                color: #cccccc;
-                text-align: center;
-              }}
-              h1 {{ color: #f48771; }}
-            </style>
-          </head>
-          <body>
-            <h1>Connection Denied</h1>
-            <p>You chose not to connect your Spotify account.</p>
-            <p style="color: #858585; font-size: 0.9em;">{error_msg}</p>
-            <script>
-              try {{
-                if (window.opener) {{
-                  window.opener.postMessage({{ type: "simrai-spotify-denied", error: "{error}" }}, "*");
-                }}
-                setTimeout(function () {{ window.close(); }}, 2000);
-              }} catch (e) {{
-                // ignore
-              }}
-            </script>
-          </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
+        logger.warning("OAuth callback: user denied access - %s", error_msg)
+        return HTMLResponse(content=_html_denied(error, error_msg))
 
     # User must have approved - verify we have the authorization code
     if not code:
         logger.warning("OAuth callback: no authorization code received")
-        html = """
-        <!DOCTYPE html>
-        <html lang="en">
-          <head>
-            <meta charset="utf-8" />
-            <title>SIMRAI – Connection Error</title>
-            <style>
-              body {
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                padding: 1.5rem;
-                background: #1e1e1e;
-                color: #cccccc;
-                text-align: center;
-              }
-              h1 { color: #f48771; }
-            </style>
-          </head>
-          <body>
-            <h1>Connection Error</h1>
-            <p>No authorization code received. Please try again.</p>
-            <script>
-              setTimeout(function () { window.close(); }, 2000);
-            </script>
-          </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
+        return HTMLResponse(content=_HTML_NO_CODE)
 
     # Verify state to prevent CSRF attacks (supports concurrent OAuth flows).
     # This must happen *before* we touch Spotify credentials so that invalid or
     # missing state always returns a Security Error page rather than a 500.
-    if not state or state not in _oauth_states:
-        logger.error(f"OAuth callback: invalid or expired state (CSRF protection)")
-        html = """
-        <!DOCTYPE html>
-        <html lang="en">
-          <head>
-            <meta charset="utf-8" />
-            <title>SIMRAI – Security Error</title>
-            <style>
-              body {
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                padding: 1.5rem;
-                background: #1e1e1e;
-                color: #cccccc;
-                text-align: center;
-              }
-              h1 { color: #f48771; }
-            </style>
-          </head>
-          <body>
-            <h1>Security Error</h1>
-            <p>Invalid OAuth state. Please try connecting again.</p>
-            <script>
-              setTimeout(function () { window.close(); }, 2000);
-            </script>
-          </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
-    
-    # Remove used state to prevent replay attacks
-    del _oauth_states[state]
+    # States are single-use: pop before checking so neither a replay nor an
+    # expired state that login has not swept yet can be accepted.
+    expires_at = _oauth_states.pop(state, None) if state else None
+    if expires_at is None or time.monotonic() > expires_at:
+        logger.error("OAuth callback: invalid or expired state (CSRF protection)")
+        return HTMLResponse(content=_HTML_BAD_STATE)
 
     # Ensure Spotify client credentials are configured before exchanging code.
     if not _cfg.spotify.client_id or not _cfg.spotify.client_secret:
@@ -678,108 +1021,53 @@ def auth_callback(
     # Exchange authorization code for tokens (only happens if user approved)
     logger.info("Exchanging authorization code for tokens")
     try:
-        resp = _oauth_http.post(
+        resp = await _oauth_http.post(
             SPOTIFY_TOKEN_URL,
             data={
                 "grant_type": "authorization_code",
                 "code": code,
                 "redirect_uri": redirect_uri,
             },
-            auth=(_cfg.spotify.client_id, _cfg.spotify.client_secret),
+            headers=_spotify_basic_auth(_cfg.spotify.client_id, _cfg.spotify.client_secret),
         )
     except httpx.HTTPError as exc:
-        logger.error(f"Failed to contact Spotify token endpoint: {exc}")
+        logger.error("Failed to contact Spotify token endpoint: %s", exc)
         raise HTTPException(status_code=502, detail=f"Failed to contact Spotify token endpoint: {exc}") from exc
 
     if resp.status_code != 200:
-        logger.error(f"Spotify token exchange failed: {resp.status_code} {resp.text}")
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-          <head>
-            <meta charset="utf-8" />
-            <title>SIMRAI – Connection Error</title>
-            <style>
-              body {{
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                padding: 1.5rem;
-                background: #1e1e1e;
-                color: #cccccc;
-                text-align: center;
-              }}
-              h1 {{ color: #f48771; }}
-            </style>
-          </head>
-          <body>
-            <h1>Connection Error</h1>
-            <p>Failed to exchange authorization code for tokens.</p>
-            <p style="color: #858585; font-size: 0.9em;">Status: {resp.status_code}</p>
-            <script>
-              setTimeout(function () {{ window.close(); }}, 2000);
-            </script>
-          </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
-
-    data = resp.json()
+        logger.error("Spotify token exchange failed: %s %s", resp.status_code, resp.text)
+        return HTMLResponse(content=_html_exchange_failed(resp.status_code))
+
+    data = _json_body(resp)
     access_token = data.get("access_token")
     refresh_token = data.get("refresh_token")
     expires_in = int(data.get("expires_in", 3600))
 
     if not access_token or not refresh_token:
         logger.error("Spotify token response missing required tokens")
-        html = """
-        <!DOCTYPE html>
-        <html lang="en">
-          <head>
-            <meta charset="utf-8" />
-            <title>SIMRAI – Connection Error</title>
-            <style>
-              body {
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                padding: 1.5rem;
-                background: #1e1e1e;
-                color: #cccccc;
-                text-align: center;
-              }
-              h1 { color: #f48771; }
-            </style>
-          </head>
-          <body>
-            <h1>Connection Error</h1>
-            <p>Spotify response missing required tokens.</p>
-            <script>
-              setTimeout(function () { window.close(); }, 2000);
-            </script>
-          </body>
-        </html>
-        """
-        return HTMLResponse(content=html)
+        return HTMLResponse(content=_HTML_MISSING_TOKENS)
 
     # Get user ID to save tokens per-user (supports concurrent users)
-    import time
-    
     logger.info("OAuth callback successful, fetching user ID")
     try:
-        me_resp = _oauth_http.get(
-            f"{SPOTIFY_API_BASE_URL}/me",
+        me_resp = await _oauth_http.get(
+            _SPOTIFY_ME_URL,
             headers={"Authorization": f"Bearer {access_token}"},
         )
     except httpx.HTTPError as exc:
-        logger.error(f"Failed to fetch user ID: {exc}")
+        logger.error("Failed to fetch user ID: %s", exc)
         raise HTTPException(status_code=502, detail=f"Failed to fetch user ID: {exc}") from exc
     
     if not me_resp.is_success:
-        logger.error(f"Failed to fetch user ID: {me_resp.status_code} {me_resp.text}")
+        logger.error("Failed to fetch user ID: %s %s", me_resp.status_code, me_resp.text)
         raise HTTPException(status_code=502, detail=f"Failed to fetch user ID: {me_resp.text}")
     
-    user_id = me_resp.json().get("id")
+    user_id = _json_body(me_resp).get("id")
     if not user_id:
         logger.error("Spotify /me response missing user id")
         raise HTTPException(status_code=502, detail="Spotify /me response missing user id.")
     
-    logger.info(f"Saving tokens for user: {user_id}")
+    logger.info("Saving tokens for user: %s", user_id)
     token_data = {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -795,48 +1083,10 @@ def auth_callback(
     # sessions survive process restarts as long as tokens are present on disk.
     session_id = user_id
     _sessions[session_id] = user_id
-    logger.info(f"Created session for user: {user_id} (session_id={session_id!r})")
+    logger.info("Created session for user: %s (session_id=%r)", user_id, session_id)
 
     # Return success page with session cookie
-    html = """
-    <!DOCTYPE html>
-    <html lang="en">
-      <head>
-        <meta charset="utf-8" />
-        <title>SIMRAI – Spotify Connected</title>
-        <style>
-          body {
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-            padding: 1.5rem;
-            background: #1e1e1e;
-            color: #cccccc;
-            text-align: center;
-          }
-          h1 { color: #4ec9b0; }
-        </style>
-      </head>
-      <body>
-        <h1>Spotify Connected ✅</h1>
-        <p>Your Spotify account has been connected successfully.</p>
-        <p style="color: #858585; font-size: 0.9em;">You can close this window and return to SIMRAI.</p>
-        <script>
-          try {
-            if (window.opener) {
-              window.opener.postMessage(
-                { type: "simrai-spotify-connected", sessionId: "%s" },
-                "*"
-              );
-            }
-            // Give the opener a moment to process, then close.
-            setTimeout(function () { window.close(); }, 1500);
-          } catch (e) {
-            // ignore
-          }
-        </script>
-      </body>
-    </html>
-    """ % session_id
-    response = HTMLResponse(content=html)
+    response = HTMLResponse(content=_html_connected(session_id))
     # Set session cookie.
     #
     # Local/dev:
@@ -870,73 +1120,53 @@ def auth_callback(
         httponly=True,
         samesite=cookie_samesite,
         secure=cookie_secure,
-        max_age=86400 * 30,  # 30 days
+        max_age=_SESSION_TTL_SECONDS,  # 30 days
     )
     return response
 
 
 @app.post("/api/search", tags=["spotify"])
-def api_search(body: SearchRequest, request: Request) -> JSONResponse:
+async def api_search(body: SearchRequest, request: Request) -> Response:
     """
     Proxy to Spotify's search endpoint using the connected user's access token.
     """
-    logger.info(f"API search request: query={body.query!r}, type={body.type}, limit={body.limit}")
+    logger.info("API search request: query=%r, type=%s, limit=%s", body.query, body.type, body.limit)
     user_id = _get_session_user_id(request)
-    token = _get_user_access_token(user_id)
+    token = await _get_user_access_token(user_id)
 
     params = {
         "q": body.query,
         "type": body.type,
-        "limit": max(1, min(body.limit, 50)),
+        "limit": body.limit,
     }
 
     try:
-        resp = _oauth_http.get(
-            f"{SPOTIFY_API_BASE_URL}/search",
-            params=params,
-            headers={"Authorization": f"Bearer {token}"},
-        )
+        resp = await _conditional_get(_SPOTIFY_SEARCH_URL, token, params=params)
     except httpx.HTTPError as exc:
-        logger.error(f"Error calling Spotify search API: {exc}")
+        logger.error("Error calling Spotify search API: %s", exc)
         raise HTTPException(status_code=502, detail=f"Error calling Spotify search: {exc}") from exc
 
     if not resp.is_success:
-        logger.error(f"Spotify search API error: {resp.status_code} {resp.text}")
+        logger.error("Spotify search API error: %s %s", resp.status_code, resp.text)
         raise HTTPException(
             status_code=resp.status_code,
             detail=f"Spotify search error: {resp.text}",
         )
 
-    logger.debug(f"Spotify search successful: {len(resp.json().get('tracks', {}).get('items', []))} results")
-    return JSONResponse(resp.json())
+    # Forward Spotify's JSON bytes untouched rather than decoding and re-encoding them.
+    return Response(content=resp.content, media_type="application/json")
 
 
 @app.get("/api/me", response_model=SpotifyUserOut, tags=["spotify"])
-def api_me(request: Request) -> SpotifyUserOut:
+async def api_me(request: Request) -> ORJSONResponse:
     """
     Return basic profile information for the connected Spotify user.
     """
     logger.debug("API /me endpoint called")
     user_id = _get_session_user_id(request)
-    token = _get_user_access_token(user_id)
-
-    try:
-        resp = _oauth_http.get(
-            f"{SPOTIFY_API_BASE_URL}/me",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-    except httpx.HTTPError as exc:
-        logger.error(f"Error calling Spotify /me API: {exc}")
-        raise HTTPException(status_code=502, detail=f"Error calling Spotify /me: {exc}") from exc
+    token = await _get_user_access_token(user_id)
 
-    if not resp.is_success:
-        logger.error(f"Spotify /me API error: {resp.status_code} {resp.text}")
-        raise HTTPException(
-            status_code=resp.status_code,
-            detail=f"Spotify /me error: {resp.text}",
-        )
-
-    data = resp.json()
+    data = await _get_spotify_profile(token)
     images = data.get("images") or []
     avatar_url: Optional[str] = None
     if isinstance(images, list) and images and isinstance(images[0], dict):
@@ -944,9 +1174,10 @@ def api_me(request: Request) -> SpotifyUserOut:
 
     user_id = data.get("id") or ""
     display_name = data.get("display_name")
-    logger.info(f"Retrieved Spotify user profile: {user_id} ({display_name})")
+    logger.info("Retrieved Spotify user profile: %s (%s)", user_id, display_name)
 
-    return SpotifyUserOut(id=user_id, display_name=display_name, avatar_url=avatar_url)
+    # Same shape as SpotifyUserOut, encoded directly (see create_queue).
+    return ORJSONResponse({"id": user_id, "display_name": display_name, "avatar_url": avatar_url})
 
 
 @app.post("/api/unlink-spotify", response_model=UnlinkSpotifyOut, tags=["spotify"])
@@ -961,11 +1192,10 @@ def api_unlink_spotify(request: Request, response: Response) -> UnlinkSpotifyOut
     
     # Get user_id from session
     session_id = request.cookies.get("simrai_session")
-    if session_id and session_id in _sessions:
-        user_id = _sessions[session_id]
+    user_id = _sessions.pop(session_id, None) if session_id else None
+    if user_id is not None:
         _delete_tokens(user_id)
-        del _sessions[session_id]
-        logger.info(f"Spotify tokens deleted for user: {user_id}")
+        logger.info("Spotify tokens deleted for user: %s", user_id)
     
     # Clear session cookie
     response.delete_cookie("simrai_session")
@@ -973,33 +1203,25 @@ def api_unlink_spotify(request: Request, response: Response) -> UnlinkSpotifyOut
     return UnlinkSpotifyOut(status="unlinked")
 
 
-@limiter.limit("5/minute")  # Max 5 playlist creations per minute per IP
-@app.post("/api/create-playlist", tags=["spotify"])
-def api_create_playlist(body: CreatePlaylistRequest, request: Request) -> JSONResponse:
+# Max 5 playlist creations per minute per IP
+@app.post("/api/create-playlist", tags=["spotify"], dependencies=[_rate_limit(5)])
+async def api_create_playlist(body: CreatePlaylistRequest, request: Request) -> ORJSONResponse:
     """
     Create a playlist in the connected user's Spotify account.
     """
-    logger.info(f"Creating playlist: name={body.name!r}, description={body.description!r}, public={body.public}")
-    user_id = _get_session_user_id(request)
-    token = _get_user_access_token(user_id)
-
-    try:
-        me_resp = _oauth_http.get(
-            f"{SPOTIFY_API_BASE_URL}/me",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-    except httpx.HTTPError as exc:
-        logger.error(f"Error calling Spotify /me for playlist creation: {exc}")
-        raise HTTPException(status_code=502, detail=f"Error calling Spotify /me: {exc}") from exc
-
-    if not me_resp.is_success:
-        logger.error(f"Spotify /me error during playlist creation: {me_resp.status_code} {me_resp.text}")
-        raise HTTPException(
-            status_code=me_resp.status_code,
-            detail=f"Spotify /me error: {me_resp.text}",
-        )
-
-    user_id = me_resp.json().get("id")
+    logger.info("Creating playlist: name=%r, description=%r, public=%s", body.name, body.description, body.public)
+    session_user_id = _get_session_user_id(request)
+    token = await _get_user_access_token(session_user_id)
+
+    # The OAuth callback stores the Spotify user id alongside the tokens, so /me is
+    # only needed for token files written before that (and is cached per token).
+    tokens = _load_tokens(session_user_id)
+    user_id = tokens.get("user_id") if tokens else None
+    if not user_id:
+        user_id = (await _get_spotify_profile(token)).get("id")
+        if user_id and tokens:
+            tokens["user_id"] = user_id
+            _save_tokens(session_user_id, tokens)
     if not user_id:
         logger.error("Spotify /me response missing user id")
         raise HTTPException(status_code=502, detail="Spotify /me response missing user id.")
@@ -1014,34 +1236,34 @@ def api_create_playlist(body: CreatePlaylistRequest, request: Request) -> JSONRe
     }
 
     try:
-        pl_resp = _oauth_http.post(
+        pl_resp = await _oauth_http.post(
             f"{SPOTIFY_API_BASE_URL}/users/{user_id}/playlists",
             json=payload,
             headers={"Authorization": f"Bearer {token}"},
         )
     except httpx.HTTPError as exc:
-        logger.error(f"Error creating Spotify playlist: {exc}")
+        logger.error("Error creating Spotify playlist: %s", exc)
         raise HTTPException(status_code=502, detail=f"Error creating Spotify playlist: {exc}") from exc
 
     if not pl_resp.is_success:
-        logger.error(f"Spotify create playlist error: {pl_resp.status_code} {pl_resp.text}")
+        logger.error("Spotify create playlist error: %s %s", pl_resp.status_code, pl_resp.text)
         raise HTTPException(
             status_code=pl_resp.status_code,
             detail=f"Spotify create playlist error: {pl_resp.text}",
         )
 
-    data = pl_resp.json()
+    data = _json_body(pl_resp)
     playlist_id = data.get("id")
     external_url = data.get("external_urls", {}).get("spotify")
-    logger.info(f"Playlist created successfully: {playlist_id} ({external_url})")
+    logger.info("Playlist created successfully: %s (%s)", playlist_id, external_url)
 
     # Best-effort: record playlist creation in stats DB (if configured)
     try:
-        _record_playlist_event(playlist_id=playlist_id, playlist_name=name)
+        await asyncio.to_thread(_record_playlist_event, playlist_id=playlist_id, playlist_name=name)
     except Exception:  # pragma: no cover - recording must never break main flow
         logger.warning("Ignoring error while recording playlist event", exc_info=True)
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "playlist_id": playlist_id,
             "url": external_url,
@@ -1049,42 +1271,66 @@ def api_create_playlist(body: CreatePlaylistRequest, request: Request) -> JSONRe
     )
 
 
-@limiter.limit("10/minute")  # Max 10 track additions per minute per IP
-@app.post("/api/add-tracks", tags=["spotify"])
-def api_add_tracks(body: AddTracksRequest, request: Request) -> JSONResponse:
+_SPOTIFY_MAX_URIS_PER_REQUEST = 100
+_SPOTIFY_MAX_RETRY_AFTER_SECONDS = 5.0
+
+
+async def _post_with_retry_after(url: str, *, retries: int = 2, **kwargs) -> httpx.Response:
+    """POST via the shared client, honouring Spotify's Retry-After on 429 (bounded wait)."""
+    for attempt in range(retries + 1):
+        resp = await _oauth_http.post(url, **kwargs)
+        if resp.status_code != 429 or attempt == retries:
+            return resp
+        try:
+            delay = float(resp.headers.get("Retry-After", "1"))
+        except (TypeError, ValueError):
+            delay = 1.0
+        delay = min(max(delay, 0.0), _SPOTIFY_MAX_RETRY_AFTER_SECONDS)
+        logger.warning("Spotify rate limited on %s; retrying in %.1fs", url, delay)
+        await asyncio.sleep(delay)
+    return resp  # pragma: no cover - loop always returns
+
+
+# Max 10 track additions per minute per IP
+@app.post("/api/add-tracks", tags=["spotify"], dependencies=[_rate_limit(10)])
+async def api_add_tracks(body: AddTracksRequest, request: Request) -> ORJSONResponse:
     """
     Add tracks to an existing Spotify playlist for the connected user.
     """
-    logger.info(f"Adding {len(body.uris)} tracks to playlist: {body.playlist_id}")
+    logger.info("Adding %s tracks to playlist: %s", len(body.uris), body.playlist_id)
     user_id = _get_session_user_id(request)
-    token = _get_user_access_token(user_id)
+    token = await _get_user_access_token(user_id)
 
     if not body.uris:
         logger.warning("Add tracks request with no URIs provided")
         raise HTTPException(status_code=400, detail="No track URIs provided.")
 
-    payload = {"uris": body.uris}
-
-    try:
-        resp = _oauth_http.post(
-            f"{SPOTIFY_API_BASE_URL}/playlists/{body.playlist_id}/tracks",
-            json=payload,
-            headers={"Authorization": f"Bearer {token}"},
-        )
-    except httpx.HTTPError as exc:
-        logger.error(f"Error adding tracks to Spotify playlist: {exc}")
-        raise HTTPException(status_code=502, detail=f"Error adding tracks to Spotify playlist: {exc}") from exc
-
-    if not resp.is_success:
-        logger.error(f"Spotify add tracks error: {resp.status_code} {resp.text}")
-        raise HTTPException(
-            status_code=resp.status_code,
-            detail=f"Spotify add tracks error: {resp.text}",
-        )
+    url = f"{SPOTIFY_API_BASE_URL}/playlists/{body.playlist_id}/tracks"
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+    # Spotify accepts at most 100 URIs per call. Chunks are sent one after another
+    # (not concurrently) because each call appends, and parallel appends would
+    # scramble the queue order.
+    for start in range(0, len(body.uris), _SPOTIFY_MAX_URIS_PER_REQUEST):
+        chunk = body.uris[start : start + _SPOTIFY_MAX_URIS_PER_REQUEST]
+        try:
+            # Pre-encoded with orjson; httpx's json= would run the stdlib encoder.
+            resp = await _post_with_retry_after(url, content=orjson.dumps({"uris": chunk}), headers=headers)
+        except httpx.HTTPError as exc:
+            logger.error("Error adding tracks to Spotify playlist: %s", exc)
+            raise HTTPException(status_code=502, detail=f"Error adding tracks to Spotify playlist: {exc}") from exc
+
+        if not resp.is_success:
+            logger.error("Spotify add tracks error: %s %s", resp.status_code, resp.text)
+            raise HTTPException(
+                status_code=resp.status_code,
+                detail=f"Spotify add tracks error: {resp.text}",
+            )
 
-    data = resp.json()
-    logger.info(f"Tracks added successfully to playlist {body.playlist_id}")
-    return JSONResponse({"snapshot_id": data.get("snapshot_id")})
+    # Only the final chunk's snapshot matters, so earlier bodies are never decoded.
+    snapshot_id = _json_body(resp).get("snapshot_id")
+    logger.info("Tracks added successfully to playlist %s", body.playlist_id)
+    return ORJSONResponse({"snapshot_id": snapshot_id})
 
 
 @app.get("/admin/playlist-stats", response_model=PlaylistStatsOut, tags=["admin"])
@@ -1103,8 +1349,8 @@ def admin_playlist_stats(
     try:
         return _fetch_playlist_stats()
     except RuntimeError as exc:
-        logger.error(f"Stats database not available: {exc}")
+        logger.error("Stats database not available: %s", exc)
         raise HTTPException(status_code=503, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - safety net
-        logger.exception(f"Failed to fetch playlist stats: {exc}")
+        logger.exception("Failed to fetch playlist stats: %s", exc)
         raise HTTPException(status_code=500, detail="Failed to fetch playlist stats") from exc
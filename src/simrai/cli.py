@@ -7,26 +7,55 @@ Commands:
 """
 
 import logging
+import math
 import typer
 from rich.console import Console
-from rich.table import Table
-import uvicorn
+from rich.text import Text
 
-from .pipeline import generate_queue
-from .spotify import SpotifyError
+from .config import setup_logging
+
+# The pipeline (Groq, httpx, Spotify client), rich.table and uvicorn are
+# imported inside the commands that use them so `simrai --help` and shell
+# completion stay fast.
 
 logger = logging.getLogger(__name__)
 
 
 app = typer.Typer(help="SIMRAI – Spotify-Induced Music Recommendation AI (mood-to-queue CLI).")
 
+# One console per process; it resolves sys.stdout on each print, so output
+# redirection (and Typer's CliRunner) still works.
+_CONSOLE = Console(highlight=False)
+
+# ASCII-style header inspired by pixel platformers (original art, not Nintendo).
+_BANNER = Text.from_markup(
+    "[bold red]"
+    "╔══════════════════════════════╗\n"
+    "║  SIMRAI  ::  PIXEL DJ MODE   ║\n"
+    "╚══════════════════════════════╝"
+    "[/bold red]"
+)
+
+
+@app.callback()
+def _main() -> None:
+    setup_logging()
+
+
+_BAR_WIDTH = 8
+_BARS = tuple("█" * filled + "·" * (_BAR_WIDTH - filled) for filled in range(_BAR_WIDTH + 1))
+_BAR_FULL = "█" * 64
+_BAR_EMPTY = "·" * 64
+
 
-def _bar(value: float, width: int = 8) -> str:
+def _bar(value: float, width: int = _BAR_WIDTH) -> str:
     """Return a simple unstyled bar visualization for a 0–1 value."""
-    value = max(0.0, min(1.0, value))
-    filled = int(round(value * width))
-    empty = width - filled
-    return "█" * filled + "·" * empty
+    if not math.isfinite(value):
+        value = 0.0
+    filled = 0 if value <= 0.0 else width if value >= 1.0 else round(value * width)
+    if width == _BAR_WIDTH:
+        return _BARS[filled]
+    return _BAR_FULL[:filled] + _BAR_EMPTY[: width - filled]
 
 
 @app.command("queue")
@@ -48,17 +77,14 @@ def queue(
 
     Automatically uses AI enhancement when available, falls back to rule-based silently.
     """
-    logger.info(f"Starting queue generation for mood: {mood!r} (length={length}, intense={intense}, soft={soft})")
-    console = Console()
+    from rich.table import Table
 
-    # ASCII-style header inspired by pixel platformers (original art, not Nintendo).
-    console.print(
-        "[bold red]"
-        "╔══════════════════════════════╗\n"
-        "║  SIMRAI  ::  PIXEL DJ MODE   ║\n"
-        "╚══════════════════════════════╝"
-        "[/bold red]"
-    )
+    from .pipeline import generate_queue
+    from .spotify import SpotifyError
+
+    logger.info(f"Starting queue generation for mood: {mood!r} (length={length}, intense={intense}, soft={soft})")
+    console = _CONSOLE
+    console.print(_BANNER)
 
     with console.status("[bold cyan]Warping pipe... Brewing your queue from the mood...[/bold cyan]"):
         try:
@@ -103,8 +129,9 @@ def queue(
         uri_snippet = track.uri
         if len(uri_snippet) > 32:
             uri_snippet = uri_snippet[:29] + "..."
-        v_cell = f"{track.valence:.2f} [gold1]{_bar(track.valence)}[/gold1]"
-        e_cell = f"{track.energy:.2f} [red1]{_bar(track.energy)}[/red1]"
+        # Styled spans instead of markup strings, so Rich has nothing to parse per cell.
+        v_cell = Text.assemble(f"{track.valence:.2f} ", (_bar(track.valence), "gold1"))
+        e_cell = Text.assemble(f"{track.energy:.2f} ", (_bar(track.energy), "red1"))
         table.add_row(
             str(idx),
             track.name,
@@ -134,6 +161,8 @@ def serve(
     Example:
         simrai serve --host 0.0.0.0 --port 8000
     """
+    import uvicorn
+
     logger.info(f"Starting SIMRAI API server on {host}:{port} (reload={reload})")
     uvicorn.run(
         "simrai.api:app",
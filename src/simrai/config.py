@@ -8,6 +8,7 @@ Actual Spotify keys and MCP endpoints will be wired in later phases.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -22,7 +23,7 @@ APP_NAME = "simrai"
 APP_AUTHOR = "Project57"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpotifyConfig:
     client_id: str
     client_secret: str
@@ -30,11 +31,12 @@ class SpotifyConfig:
     use_mcp_first: bool = False  # If True and mcp_server_url is set, prefer MCP over direct Web API.
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     spotify: SpotifyConfig
 
 
+@lru_cache(maxsize=1)
 def get_default_config_dir() -> Path:
     """
     Returns the platform-appropriate directory for persistent SIMRAI config.
@@ -42,10 +44,14 @@ def get_default_config_dir() -> Path:
     return Path(user_config_dir(APP_NAME, APP_AUTHOR))
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
     """
     Load configuration from environment variables / .env file.
 
+    The .env file is parsed once per process; later calls return the same
+    AppConfig. Call ``load_config.cache_clear()`` to pick up changed settings.
+
     Phase 0: keep this minimal; later phases may add TOML/JSON config files.
     """
     # Load from a .env file in the project root or current directory, if present.
@@ -70,16 +76,28 @@ def load_config() -> AppConfig:
     return AppConfig(spotify=spotify_cfg)
 
 
+_LOGGING_CONFIGURED = False
+
+
 def setup_logging() -> None:
     """
     Configure centralized logging for SIMRAI using Python's built-in logging module.
     
     - Logs to ~/.simrai/logs/simrai.log
     - Uses RotatingFileHandler with 10MB max size and 5 backup files
-    - Logs to both file and console
+    - Logs to both file and console (set SIMRAI_LOG_CONSOLE=0 to keep stderr quiet)
     - Format: "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d | %(message)s"
     - Default level: INFO (can be overridden via SIMRAI_LOG_LEVEL env var)
+
+    Called by the CLI entrypoint and the API lifespan rather than at import, so
+    importing SIMRAI (or running `simrai --help`) does not touch the log directory.
+    Only the first call configures anything; `simrai serve` reaches it twice.
     """
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    _LOGGING_CONFIGURED = True
+
     # Get log level from environment variable, default to INFO
     log_level_str = os.getenv("SIMRAI_LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
@@ -112,16 +130,14 @@ def setup_logging() -> None:
     file_handler.setFormatter(logging.Formatter(log_format, date_format))
     root_logger.addHandler(file_handler)
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(logging.Formatter(log_format, date_format))
-    root_logger.addHandler(console_handler)
-
-
-# Initialize logging when module is imported (after get_default_config_dir is defined)
-setup_logging()
-
-__all__ = ["AppConfig", "SpotifyConfig", "get_default_config_dir", "load_config"]
+    # Console handler. Left on by default: on hosted deploys stderr is the only
+    # log sink anyone reads (uvicorn's own handlers cover just uvicorn.* loggers).
+    if os.getenv("SIMRAI_LOG_CONSOLE", "1") != "0":
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(log_level)
+        console_handler.setFormatter(logging.Formatter(log_format, date_format))
+        root_logger.addHandler(console_handler)
+
+__all__ = ["AppConfig", "SpotifyConfig", "get_default_config_dir", "load_config", "setup_logging"]
 
 
@@ -8,13 +8,22 @@ For the 48-hour MVP we use a simple rule-based approach instead of an LLM:
 
 from __future__ import annotations
 
-import json
+import array
+import hashlib
 import logging
 import os
-from collections import deque
+import re
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
-from time import time
-from typing import Any, Deque, Dict, List, Optional
+from time import monotonic, time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+
+from .cache import TTLCache
+from .config import get_default_config_dir
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +35,13 @@ except Exception:  # pragma: no cover - missing dependency is handled gracefully
     Groq = None  # type: ignore[assignment]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MoodVector:
     valence: float  # 0.0–1.0, emotional positivity
     energy: float   # 0.0–1.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MoodInterpretation:
     vector: MoodVector
     search_terms: List[str]
@@ -40,42 +49,192 @@ class MoodInterpretation:
     prefer_obscure: bool = False
     prefer_recent: bool = False
     prefer_classics: bool = False
+    # True when Groq supplied (or the Groq cache replayed) the refinement; False
+    # for pure rule-based results, including fallbacks after a Groq failure.
+    from_groq: bool = False
+
+
+NEGATIVE_WORDS = frozenset({"sad", "cry", "lonely", "alone", "hurt", "broken", "melancholy", "melancholic"})
+POSITIVE_WORDS = frozenset({"happy", "joy", "euphoric", "victory", "celebration", "party"})
+LOW_ENERGY_WORDS = frozenset({"chill", "sleep", "calm", "midnight", "night", "late"})
+HIGH_ENERGY_WORDS = frozenset({"hype", "rage", "workout", "gym", "dance", "party", "run"})
+
+POPULAR_WORDS = frozenset({"hits", "popular", "mainstream", "bangers", "anthems"})
+OBSCURE_WORDS = frozenset({"underground", "obscure", "deep", "rare", "b-sides"})
+RECENT_WORDS = frozenset({"new", "recent", "latest", "fresh", "2020s", "2023", "2024", "2025"})
+CLASSIC_WORDS = frozenset({"classic", "retro", "throwback", "old-school", "90s", "80s", "70s", "2000s"})
+
+# One bit per keyword group so a single pass over the tokens collects every
+# rule-based signal. Hyphens are kept in tokens for "b-sides" / "old-school".
+_NEG, _POS, _LOW, _HIGH, _POP, _OBS, _REC, _CLA = (1 << i for i in range(8))
+_KEYWORD_FLAGS: Dict[str, int] = {}
+for _flag, _words in (
+    (_NEG, NEGATIVE_WORDS),
+    (_POS, POSITIVE_WORDS),
+    (_LOW, LOW_ENERGY_WORDS),
+    (_HIGH, HIGH_ENERGY_WORDS),
+    (_POP, POPULAR_WORDS),
+    (_OBS, OBSCURE_WORDS),
+    (_REC, RECENT_WORDS),
+    (_CLA, CLASSIC_WORDS),
+):
+    for _word in _words:
+        _KEYWORD_FLAGS[_word] = _KEYWORD_FLAGS.get(_word, 0) | _flag
+del _flag, _words, _word
+_TOKEN_RE = re.compile(r"[a-z0-9'-]+")
+_PREFERENCE_KEYS = ("prefer_popular", "prefer_obscure", "prefer_recent", "prefer_classics")
+
+# Hard bound on a single Groq call. On timeout we fall back to rule-based output
+# instead of retrying, so a stalled LLM never holds a /queue request hostage.
+_GROQ_TIMEOUT_SECONDS = float(os.getenv("SIMRAI_GROQ_TIMEOUT_SECONDS", "5.0"))
+_GROQ_MODEL = os.getenv("SIMRAI_GROQ_MODEL", "llama-3.1-8b-instant")
 
-
-NEGATIVE_WORDS = {"sad", "cry", "lonely", "alone", "hurt", "broken", "melancholy", "melancholic"}
-POSITIVE_WORDS = {"happy", "joy", "euphoric", "victory", "celebration", "party"}
-LOW_ENERGY_WORDS = {"chill", "sleep", "calm", "midnight", "night", "late"}
-HIGH_ENERGY_WORDS = {"hype", "rage", "workout", "gym", "dance", "party", "run"}
-
-POPULAR_WORDS = {"hits", "popular", "mainstream", "bangers", "anthems"}
-OBSCURE_WORDS = {"underground", "obscure", "deep", "rare", "b-sides", "b-sides"}
-RECENT_WORDS = {"new", "recent", "latest", "fresh", "2020s", "2023", "2024", "2025"}
-CLASSIC_WORDS = {"classic", "retro", "throwback", "old-school", "90s", "80s", "70s", "2000s"}
-
-_GROQ_CALL_TIMES: Deque[float] = deque()
 _GROQ_MAX_CALLS_PER_MINUTE = max(
     1,
     int(os.getenv("SIMRAI_GROQ_MAX_CALLS_PER_MINUTE", "20")),
 )
+# Ring of the last N admitted call times (monotonic). The slot about to be
+# overwritten holds the oldest one, so admission is a single comparison.
+_GROQ_CALL_RING = array.array("d", [float("-inf")] * _GROQ_MAX_CALLS_PER_MINUTE)
+_GROQ_CALL_POS = 0
+_GROQ_CALL_LOCK = threading.Lock()
+
+
+# Compact, JSON-only instruction for the Groq mood call; built once at import.
+_GROQ_SYSTEM_PROMPT = (
+    "You are a mood-to-music assistant. Given a short mood description and flags "
+    "for intense/soft, you output ONLY a single JSON object with fields: "
+    "{"
+    '"valence": float between 0 and 1, '
+    '"energy": float between 0 and 1, '
+    '"search_terms": list of 3-8 short phrases for music search, '
+    '"prefer_popular": bool, '
+    '"prefer_obscure": bool, '
+    '"prefer_recent": bool, '
+    '"prefer_classics": bool'
+    "}. No explanation, no markdown, just JSON."
+)
+_GROQ_SYSTEM_MESSAGE = {"role": "system", "content": _GROQ_SYSTEM_PROMPT}
+
+# Groq results are cached in two tiers:
+# - in memory, keyed by the normalized mood text and flags (exact repeats);
+# - on disk, keyed by a hash of the sorted word bag, so reordered prompts such as
+#   "rainy midnight drive" / "midnight drive rainy" also skip the LLM across runs.
+_MOOD_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_MOOD_CACHE: TTLCache[Dict[str, Any]] = TTLCache(maxsize=1024, ttl=_MOOD_CACHE_TTL_SECONDS)
+_MOOD_DISK_CACHE_PATH = get_default_config_dir() / "cache" / "mood_ai.json"
+# Bounds the file (and the cost of rewriting it on each store); the oldest
+# entries are evicted first.
+_MOOD_DISK_CACHE_MAX_ENTRIES = 2048
+_MOOD_DISK_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+_MOOD_DISK_LOCK = threading.Lock()
+
+# Identical mood requests that arrive while a Groq call for them is already in
+# flight wait on that call's result instead of issuing their own.
+_GROQ_INFLIGHT: Dict[Tuple[str, bool, bool], "Future[Optional[Dict[str, Any]]]"] = {}
+_GROQ_INFLIGHT_LOCK = threading.Lock()
 
 
 def clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
-    return max(lo, min(hi, value))
+    # Conditional expression instead of max(min(...)): no builtin calls on the hot path.
+    return lo if value < lo else hi if value > hi else value
 
 
 def _can_call_groq() -> bool:
     """Simple in-process rate limiter to stay under a safe free-tier budget."""
-    now = time()
-    # Drop timestamps older than 60 seconds.
-    while _GROQ_CALL_TIMES and now - _GROQ_CALL_TIMES[0] > 60:
-        _GROQ_CALL_TIMES.popleft()
-    if len(_GROQ_CALL_TIMES) >= _GROQ_MAX_CALLS_PER_MINUTE:
-        logger.warning(f"Groq rate limit reached: {len(_GROQ_CALL_TIMES)} calls in the last minute (max: {_GROQ_MAX_CALLS_PER_MINUTE})")
-        return False
-    _GROQ_CALL_TIMES.append(now)
+    global _GROQ_CALL_POS
+    now = monotonic()
+    with _GROQ_CALL_LOCK:
+        if now - _GROQ_CALL_RING[_GROQ_CALL_POS] <= 60:
+            logger.warning(f"Groq rate limit reached: {_GROQ_MAX_CALLS_PER_MINUTE} calls in the last minute")
+            return False
+        _GROQ_CALL_RING[_GROQ_CALL_POS] = now
+        _GROQ_CALL_POS = (_GROQ_CALL_POS + 1) % _GROQ_MAX_CALLS_PER_MINUTE
     return True
 
 
+def _mood_cache_keys(text: str, intense: bool, soft: bool) -> Tuple[Tuple[str, bool, bool], str]:
+    """Return the (exact, word-bag hash) cache keys for a mood request."""
+    normalized = " ".join(text.lower().split())
+    bag = " ".join(sorted(normalized.replace(",", " ").split()))
+    digest = hashlib.blake2b(
+        f"{bag}|{int(intense)}|{int(soft)}".encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return (normalized, intense, soft), digest
+
+
+def _load_disk_cache() -> Dict[str, Dict[str, Any]]:
+    """
+    Lazily read the on-disk mood cache, dropping expired entries. Caller holds the lock.
+
+    Entries are kept oldest-first (by "ts") so eviction can pop from the front.
+    """
+    global _MOOD_DISK_CACHE
+    if _MOOD_DISK_CACHE is None:
+        entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            raw = orjson.loads(_MOOD_DISK_CACHE_PATH.read_bytes())
+            if isinstance(raw, dict):
+                cutoff = time() - _MOOD_CACHE_TTL_SECONDS
+                live = [
+                    (k, v)
+                    for k, v in raw.items()
+                    if isinstance(v, dict) and v.get("ts", 0) >= cutoff and isinstance(v.get("data"), dict)
+                ]
+                live.sort(key=lambda kv: kv[1]["ts"])
+                entries = dict(live[-_MOOD_DISK_CACHE_MAX_ENTRIES:])
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.debug(f"Ignoring unreadable mood cache {_MOOD_DISK_CACHE_PATH}: {exc}")
+        _MOOD_DISK_CACHE = entries
+    return _MOOD_DISK_CACHE
+
+
+def _get_cached_mood_ai(text: str, intense: bool, soft: bool) -> Optional[Dict[str, Any]]:
+    exact_key, digest = _mood_cache_keys(text, intense, soft)
+    data = _MOOD_CACHE.get(exact_key)
+    if data is not None:
+        return data
+    with _MOOD_DISK_LOCK:
+        entry = _load_disk_cache().get(digest)
+    if entry is None or entry.get("ts", 0) < time() - _MOOD_CACHE_TTL_SECONDS:
+        return None
+    data = entry["data"]
+    _MOOD_CACHE.set(exact_key, data)
+    return data
+
+
+def _store_cached_mood_ai(text: str, intense: bool, soft: bool, data: Dict[str, Any]) -> None:
+    exact_key, digest = _mood_cache_keys(text, intense, soft)
+    _MOOD_CACHE.set(exact_key, data)
+    with _MOOD_DISK_LOCK:
+        entries = _load_disk_cache()
+        now = time()
+        # Re-insert at the end so the dict stays ordered oldest-first.
+        entries.pop(digest, None)
+        entries[digest] = {"ts": now, "data": data}
+        # Drop expired entries and anything over the cap, oldest first.
+        cutoff = now - _MOOD_CACHE_TTL_SECONDS
+        while entries:
+            oldest_key = next(iter(entries))
+            if len(entries) <= _MOOD_DISK_CACHE_MAX_ENTRIES and entries[oldest_key].get("ts", 0) >= cutoff:
+                break
+            del entries[oldest_key]
+        try:
+            _MOOD_DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = _MOOD_DISK_CACHE_PATH.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(entries))
+            tmp_path.replace(_MOOD_DISK_CACHE_PATH)
+        except OSError as exc:
+            logger.debug(f"Could not persist mood cache: {exc}")
+
+
+def groq_configured() -> bool:
+    """Whether Groq refinement is available at all (SDK installed and GROQ_API_KEY set)."""
+    return Groq is not None and bool(os.getenv("GROQ_API_KEY"))
+
+
 def _call_groq_mood_ai(
     text: str,
     *,
@@ -90,6 +249,11 @@ def _call_groq_mood_ai(
     - GROQ_API_KEY          (required for calls)
     - SIMRAI_GROQ_MODEL     (optional, default is an OSS model name)
     - SIMRAI_GROQ_MAX_CALLS_PER_MINUTE (rate limiting, default 20)
+    - SIMRAI_GROQ_TIMEOUT_SECONDS (per-call timeout, default 5; no retries)
+
+    Successful results are cached (memory + disk, 7-day TTL), and cache hits
+    do not count against the rate limit. Concurrent identical requests share
+    a single in-flight call.
 
     Returns a small dict with optional keys:
     - valence (float 0–1)
@@ -97,62 +261,143 @@ def _call_groq_mood_ai(
     - search_terms (list[str])
     - prefer_popular / prefer_obscure / prefer_recent / prefer_classics (bool)
     """
-    if Groq is None:
+    if not groq_configured():
         return None
+    api_key = os.environ["GROQ_API_KEY"]
+
+    cached = _get_cached_mood_ai(text, intense, soft)
+    if cached is not None:
+        logger.debug("Using cached Groq mood interpretation")
+        return cached
+
+    key, _ = _mood_cache_keys(text, intense, soft)
+    with _GROQ_INFLIGHT_LOCK:
+        future = _GROQ_INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _GROQ_INFLIGHT[key] = future
+    if not is_leader:
+        logger.debug("Joining in-flight Groq mood interpretation")
+        return future.result()
+
+    data: Optional[Dict[str, Any]] = None
+    try:
+        data = _request_groq_mood_ai(text, intense=intense, soft=soft, api_key=api_key)
+    finally:
+        with _GROQ_INFLIGHT_LOCK:
+            _GROQ_INFLIGHT.pop(key, None)
+        future.set_result(data)
+    return data
+
+
+# The shared Groq client and the API key it was built for, so a key change (or
+# close_groq_client) can close the old client's connection pool.
+_GROQ_CLIENT: Optional[Tuple[str, Any]] = None
+_GROQ_CLIENT_LOCK = threading.Lock()
+
+
+def _get_groq_client(api_key: str) -> Any:
+    """
+    Return a process-wide Groq client for `api_key`.
+
+    The client sits on a pooled HTTP/2 httpx connection, so consecutive mood
+    calls reuse one TLS session instead of handshaking with api.groq.com each time.
+    Calls are bounded by `_GROQ_TIMEOUT_SECONDS` and never retried.
+    """
+    global _GROQ_CLIENT
+    with _GROQ_CLIENT_LOCK:
+        if _GROQ_CLIENT is not None and _GROQ_CLIENT[0] == api_key:
+            return _GROQ_CLIENT[1]
+        stale = _GROQ_CLIENT[1] if _GROQ_CLIENT is not None else None
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=_GROQ_TIMEOUT_SECONDS,
+        )
+        client = Groq(
+            api_key=api_key,
+            http_client=http_client,
+            timeout=_GROQ_TIMEOUT_SECONDS,
+            max_retries=0,
+        )
+        _GROQ_CLIENT = (api_key, client)
+    if stale is not None:
+        stale.close()
+    return client
+
+
+def close_groq_client() -> None:
+    """Close and drop the shared Groq client (e.g. on server shutdown)."""
+    global _GROQ_CLIENT
+    with _GROQ_CLIENT_LOCK:
+        cached, _GROQ_CLIENT = _GROQ_CLIENT, None
+    if cached is not None:
+        cached[1].close()
 
+
+def warmup_groq() -> None:
+    """
+    Build the shared Groq client and open its connection ahead of the first
+    mood call. No-op when Groq is not configured; failures are only logged.
+    """
     api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        return None
+    if Groq is None or not api_key:
+        return
+    try:
+        # A cheap authenticated GET completes the TLS handshake on the pooled connection.
+        _get_groq_client(api_key).models.list()
+    except Exception as exc:
+        logger.debug(f"Groq warmup skipped: {exc}")
+
 
+def _request_groq_mood_ai(
+    text: str,
+    *,
+    intense: bool,
+    soft: bool,
+    api_key: str,
+) -> Optional[Dict[str, Any]]:
+    """Issue the actual Groq completion for `_call_groq_mood_ai` (rate-limited, cached on success)."""
     if not _can_call_groq():
         # Soft-fail: stay under free-tier by skipping LLM when over budget.
         return None
 
-    model = os.getenv("SIMRAI_GROQ_MODEL", "llama-3.1-8b-instant")
+    model = _GROQ_MODEL
     logger.debug(f"Calling Groq API for mood interpretation: model={model}")
 
-    # Compose a compact, JSON-only instruction to keep parsing robust.
-    system_prompt = (
-        "You are a mood-to-music assistant. Given a short mood description and flags "
-        "for intense/soft, you output ONLY a single JSON object with fields: "
-        "{"
-        '"valence": float between 0 and 1, '
-        '"energy": float between 0 and 1, '
-        '"search_terms": list of 3-8 short phrases for music search, '
-        '"prefer_popular": bool, '
-        '"prefer_obscure": bool, '
-        '"prefer_recent": bool, '
-        '"prefer_classics": bool'
-        "}. No explanation, no markdown, just JSON."
-    )
-    user_prompt = json.dumps(
+    user_prompt = orjson.dumps(
         {
             "mood": text,
             "intense": intense,
             "soft": soft,
         }
-    )
+    ).decode("utf-8")
 
     try:
-        client = Groq(api_key=api_key)
+        client = _get_groq_client(api_key)
         resp = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                _GROQ_SYSTEM_MESSAGE,
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.3,
             max_tokens=256,
+            # JSON mode: the model is constrained to emit one valid JSON object,
+            # so the reply can go straight to orjson.loads without cleanup.
+            response_format={"type": "json_object"},
         )
         choice = resp.choices[0].message.content if resp.choices else ""
         if not choice:
             logger.debug("Groq API returned empty response")
             return None
-        data = json.loads(choice)
+        data = orjson.loads(choice)
         if not isinstance(data, dict):
             logger.debug("Groq API response is not a dict")
             return None
         logger.info(f"Groq AI mood interpretation successful: valence={data.get('valence')}, energy={data.get('energy')}")
+        _store_cached_mood_ai(text, intense, soft, data)
         return data
     except Exception as exc:
         # Any Groq/network/JSON error: quietly fall back to rule-based logic.
@@ -171,61 +416,60 @@ def interpret_mood(text: str, *, intense: bool = False, soft: bool = False) -> M
     - Falls back gracefully to pure rule-based behavior on any error.
     """
     logger.info(f"Processing mood: {text!r} (intense={intense}, soft={soft})")
-    base_valence = 0.5
-    base_energy = 0.5
-
-    lowered = text.lower()
-    tokens = set(lowered.replace(",", " ").split())
-
-    # Adjust valence.
-    if tokens & NEGATIVE_WORDS:
-        base_valence -= 0.2
-    if tokens & POSITIVE_WORDS:
-        base_valence += 0.2
 
-    # Adjust energy.
-    if tokens & LOW_ENERGY_WORDS:
-        base_energy -= 0.2
-    if tokens & HIGH_ENERGY_WORDS:
-        base_energy += 0.2
-
-    # Flags.
-    if intense:
-        base_energy += 0.2
-        base_valence += 0.05  # slight push toward more vivid moods
-    if soft:
-        base_energy -= 0.2
-        base_valence -= 0.05  # tilt slightly toward introspective
-
-    # Base metadata preferences inferred from wording.
-    prefer_popular = bool(tokens & POPULAR_WORDS)
-    prefer_obscure = bool(tokens & OBSCURE_WORDS)
-    prefer_recent = bool(tokens & RECENT_WORDS)
-    prefer_classics = bool(tokens & CLASSIC_WORDS)
-
-    # Optional Groq AI refinement.
+    # Optional Groq AI refinement. Asked first so the keyword heuristic only runs
+    # for the fields the model did not supply.
     ai_data = _call_groq_mood_ai(text, intense=intense, soft=soft)
+    ai_valence: Optional[float] = None
+    ai_energy: Optional[float] = None
+    ai_prefs: Dict[str, bool] = {}
     if ai_data:
         logger.debug("Applying AI-enhanced mood interpretation")
-        # Override valence/energy if present.
         v = ai_data.get("valence")
         e = ai_data.get("energy")
         if isinstance(v, (int, float)):
-            base_valence = float(v)
+            ai_valence = float(v)
         if isinstance(e, (int, float)):
-            base_energy = float(e)
-
-        # Override metadata preferences where provided.
-        for key in ("prefer_popular", "prefer_obscure", "prefer_recent", "prefer_classics"):
-            if key in ai_data and isinstance(ai_data[key], bool):
-                if key == "prefer_popular":
-                    prefer_popular = ai_data[key]
-                elif key == "prefer_obscure":
-                    prefer_obscure = ai_data[key]
-                elif key == "prefer_recent":
-                    prefer_recent = ai_data[key]
-                elif key == "prefer_classics":
-                    prefer_classics = ai_data[key]
+            ai_energy = float(e)
+        ai_prefs = {key: ai_data[key] for key in _PREFERENCE_KEYS if isinstance(ai_data.get(key), bool)}
+
+    base_valence = 0.5
+    base_energy = 0.5
+    flags = 0
+    if ai_valence is None or ai_energy is None or len(ai_prefs) < len(_PREFERENCE_KEYS):
+        for token in _TOKEN_RE.findall(text.lower()):
+            flags |= _KEYWORD_FLAGS.get(token, 0)
+
+        # Adjust valence.
+        if flags & _NEG:
+            base_valence -= 0.2
+        if flags & _POS:
+            base_valence += 0.2
+
+        # Adjust energy.
+        if flags & _LOW:
+            base_energy -= 0.2
+        if flags & _HIGH:
+            base_energy += 0.2
+
+        # Flags.
+        if intense:
+            base_energy += 0.2
+            base_valence += 0.05  # slight push toward more vivid moods
+        if soft:
+            base_energy -= 0.2
+            base_valence -= 0.05  # tilt slightly toward introspective
+
+    if ai_valence is not None:
+        base_valence = ai_valence
+    if ai_energy is not None:
+        base_energy = ai_energy
+
+    # Metadata preferences: the model's answer where given, else inferred from wording.
+    prefer_popular = ai_prefs.get("prefer_popular", bool(flags & _POP))
+    prefer_obscure = ai_prefs.get("prefer_obscure", bool(flags & _OBS))
+    prefer_recent = ai_prefs.get("prefer_recent", bool(flags & _REC))
+    prefer_classics = ai_prefs.get("prefer_classics", bool(flags & _CLA))
 
     vector = MoodVector(
         valence=clamp(base_valence),
@@ -248,6 +492,13 @@ def interpret_mood(text: str, *, intense: bool = False, soft: bool = False) -> M
                 if isinstance(term, str) and term.strip():
                     search_terms.append(term.strip())
 
+    # Drop case/whitespace duplicates (e.g. the model echoing the mood text back),
+    # keeping the first spelling and the original order. dict keeps it O(n).
+    unique_terms: Dict[str, str] = {}
+    for term in search_terms:
+        unique_terms.setdefault(" ".join(term.lower().split()), term)
+    search_terms = list(unique_terms.values())
+
     interpretation = MoodInterpretation(
         vector=vector,
         search_terms=search_terms,
@@ -255,11 +506,12 @@ def interpret_mood(text: str, *, intense: bool = False, soft: bool = False) -> M
         prefer_obscure=prefer_obscure,
         prefer_recent=prefer_recent,
         prefer_classics=prefer_classics,
+        from_groq=bool(ai_data),
     )
     logger.info(f"Mood interpretation complete: valence={vector.valence:.2f}, energy={vector.energy:.2f}, search_terms={len(search_terms)}")
     return interpretation
 
 
-__all__ = ["MoodVector", "MoodInterpretation", "interpret_mood"]
+__all__ = ["MoodVector", "MoodInterpretation", "clamp", "close_groq_client", "groq_configured", "interpret_mood", "warmup_groq"]
 
 
@@ -12,17 +12,21 @@ Note: This pipeline uses metadata-only mode (no audio-features endpoint).
 
 from __future__ import annotations
 
+import heapq
 import logging
+import re
+import threading
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import List, Optional
 
-from .mood import MoodInterpretation, MoodVector, interpret_mood
+from .mood import MoodInterpretation, MoodVector, clamp, interpret_mood, warmup_groq
 from .spotify import SpotifyService
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QueueTrack:
     name: str
     artists: str
@@ -34,17 +38,86 @@ class QueueTrack:
     duration_ms: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class QueueResult:
     mood_text: str
     mood_vector: MoodVector
     tracks: List[QueueTrack]
     summary: str
+    # Carried over from MoodInterpretation.from_groq.
+    from_groq: bool = False
+
+
+# One SpotifyService per process: its access token and HTTP connection pool are
+# reused across queue generations instead of being rebuilt for every request.
+_SHARED_SERVICE: Optional[SpotifyService] = None
+_SHARED_SERVICE_LOCK = threading.Lock()
+
+
+def get_spotify_service() -> SpotifyService:
+    """Return the process-wide SpotifyService, creating it on first use."""
+    global _SHARED_SERVICE
+    service = _SHARED_SERVICE
+    if service is None:
+        with _SHARED_SERVICE_LOCK:
+            if _SHARED_SERVICE is None:
+                _SHARED_SERVICE = SpotifyService()
+            service = _SHARED_SERVICE
+    return service
+
+
+def close_spotify_service() -> None:
+    """Close and drop the shared SpotifyService (e.g. on server shutdown)."""
+    global _SHARED_SERVICE
+    with _SHARED_SERVICE_LOCK:
+        service, _SHARED_SERVICE = _SHARED_SERVICE, None
+    if service is not None:
+        service.close()
+
+
+def warmup() -> None:
+    """
+    Pay one-time costs ahead of the first queue: build the Groq client and fetch
+    a Spotify token, opening both connections.
+
+    This is the only warmup path; generate_queue itself never pre-fetches, so
+    long-lived callers (the API lifespan) should call this once at startup.
+    """
+    warmup_groq()
+    get_spotify_service().warmup()
+
+
+# Substrings of track/album names that hint at energy. Each group is one
+# case-insensitive alternation, so a name is scanned once per group without
+# first building a lowercased copy.
+_HIGH_ENERGY_TOKENS = ("remix", "rmx", "club", "live", "edit", "mix", "bass", "trap", "drum", "dubstep")
+_LOW_ENERGY_TOKENS = ("acoustic", "piano", "ambient", "lofi", "lo-fi", "unplugged", "ballad", "instrumental")
+_HIGH_ENERGY_RE = re.compile("|".join(map(re.escape, _HIGH_ENERGY_TOKENS)), re.IGNORECASE)
+_LOW_ENERGY_RE = re.compile("|".join(map(re.escape, _LOW_ENERGY_TOKENS)), re.IGNORECASE)
+
+
+def _metadata_baseline(vec: MoodVector, interpretation: MoodInterpretation) -> tuple[float, float]:
+    """
+    Return the per-queue starting (valence, energy) for metadata estimates.
+
+    The mood vector plus the user's preference nudges; identical for every
+    candidate, so it is computed once per queue rather than once per track.
+    """
+    v = vec.valence
+    e = vec.energy
+    if interpretation.prefer_obscure:
+        e -= 0.05
+    if interpretation.prefer_popular:
+        e += 0.05
+    if interpretation.prefer_classics:
+        v -= 0.05
+    if interpretation.prefer_recent:
+        v += 0.05
+    return v, e
 
 
 def _metadata_valence_energy(
-    vec: MoodVector,
-    interpretation: MoodInterpretation,
+    baseline: tuple[float, float],
     popularity: Optional[int],
     year: Optional[int],
     text: str,
@@ -53,21 +126,21 @@ def _metadata_valence_energy(
     Derive a synthetic (valence, energy) estimate from metadata only.
 
     This is a heuristic used when Spotify audio features are unavailable.
+    `baseline` comes from `_metadata_baseline`.
     """
     # Normalize popularity to [0, 1].
     pop_norm = 0.0
     if popularity is not None:
-        pop_norm = max(0.0, min(1.0, popularity / 100.0))
+        pop_norm = clamp(popularity / 100.0)
 
     # Normalize year very roughly between 1970 and 2025.
     year_norm = 0.5
     if year is not None:
-        y = max(1970, min(2025, year))
+        y = clamp(year, 1970, 2025)
         year_norm = (y - 1970) / (2025 - 1970)
 
-    # Start near the mood vector.
-    base_v = vec.valence
-    base_e = vec.energy
+    # Start near the mood vector (already nudged by the user's preferences).
+    base_v, base_e = baseline
 
     # Use popularity and year as signals:
     # - newer & more popular tracks skew higher energy and valence.
@@ -75,52 +148,79 @@ def _metadata_valence_energy(
     e = base_e + 0.40 * (pop_norm - 0.5) + 0.25 * (year_norm - 0.5)
 
     # Text-based heuristics from track/album names.
-    lowered = text.lower()
-    high_energy_tokens = (
-        "remix",
-        "rmx",
-        "club",
-        "live",
-        "edit",
-        "mix",
-        "bass",
-        "trap",
-        "drum",
-        "dubstep",
-    )
-    low_energy_tokens = (
-        "acoustic",
-        "piano",
-        "ambient",
-        "lofi",
-        "lo-fi",
-        "unplugged",
-        "ballad",
-        "instrumental",
-    )
-    if any(tok in lowered for tok in high_energy_tokens):
+    if _HIGH_ENERGY_RE.search(text):
         e += 0.15
         v += 0.05
-    if any(tok in lowered for tok in low_energy_tokens):
+    if _LOW_ENERGY_RE.search(text):
         e -= 0.15
         v -= 0.05
 
-    # Apply user preferences.
-    if interpretation.prefer_obscure:
-        e -= 0.05
-    if interpretation.prefer_popular:
-        e += 0.05
-    if interpretation.prefer_classics:
-        v -= 0.05
-    if interpretation.prefer_recent:
-        v += 0.05
-
     # Clamp to [0, 1].
-    v = max(0.0, min(1.0, v))
-    e = max(0.0, min(1.0, e))
+    v = clamp(v)
+    e = clamp(e)
     return v, e
 
 
+def _dedupe_candidates(candidates: List[dict]) -> List[dict]:
+    """
+    Drop near-duplicate search results, keeping Spotify's first (most relevant) hit.
+
+    Remasters, deluxe editions and regional releases of one song share the lead
+    artist and the title before any " - Remastered 2011"-style suffix.
+    """
+    seen: set = set()
+    unique: List[dict] = []
+    for t in candidates:
+        artists = t.get("artists") or []
+        name = t.get("name")
+        if not artists or not isinstance(name, str):
+            unique.append(t)
+            continue
+        lead = artists[0].get("id") or artists[0].get("name")
+        key = (lead, name.split(" - ", 1)[0].strip().lower())
+        if key not in seen:
+            seen.add(key)
+            unique.append(t)
+    return unique
+
+
+@dataclass(slots=True)
+class _Candidate:
+    """A search result with just the fields ranking and duration selection need."""
+
+    raw: dict
+    popularity: Optional[int]
+    year: Optional[int]
+    duration_ms: Optional[int]
+    score: float
+
+
+_candidate_score = attrgetter("score")
+
+
+def _build_queue_track(cand: _Candidate, baseline: tuple[float, float]) -> QueueTrack:
+    t = cand.raw
+    tid = t.get("id")
+    name = t.get("name", "<unknown>")
+    artists = ", ".join(a.get("name", "") for a in t.get("artists", []) or [])
+    uri = t.get("uri") or (f"spotify:track:{tid}" if tid else "<unknown>")
+
+    # Use track + album name for text-based heuristics
+    text = f"{name} {(t.get('album') or {}).get('name', '')}"
+    valence, energy = _metadata_valence_energy(baseline, cand.popularity, cand.year, text)
+
+    return QueueTrack(
+        name=name,
+        artists=artists,
+        uri=uri,
+        valence=valence,
+        energy=energy,
+        popularity=cand.popularity,
+        year=cand.year,
+        duration_ms=cand.duration_ms,
+    )
+
+
 def generate_queue(
     mood_text: str,
     *,
@@ -128,6 +228,7 @@ def generate_queue(
     duration_minutes: Optional[int] = None,
     intense: bool = False,
     soft: bool = False,
+    mood_override: Optional[MoodInterpretation] = None,
     ) -> QueueResult:
     """
     Generate a simple ordered queue for a mood using the v0 pipeline.
@@ -137,6 +238,10 @@ def generate_queue(
       to refine the mood vector and search terms.
     - Queue generation itself is purely metadata-based (Spotify search + heuristics),
       with no CrewAI or audio-features endpoint.
+
+    Pass `mood_override` to use an already-computed interpretation and skip
+    `interpret_mood` entirely (no global patching needed, so it is safe under
+    concurrent callers).
     """
     logger.info(
         "Generating queue for mood: %r (length=%d, duration=%s, intense=%s, soft=%s)",
@@ -147,194 +252,191 @@ def generate_queue(
         soft,
     )
 
-    # Interpret mood (rule-based core with optional Groq refinement inside interpret_mood)
-    logger.debug("Interpreting mood using rule-based + optional Groq refinement")
-    interpretation: MoodInterpretation = interpret_mood(mood_text, intense=intense, soft=soft)
+    service = get_spotify_service()
+    # Interpret mood (rule-based core with optional Groq refinement inside interpret_mood).
+    interpretation: MoodInterpretation
+    if mood_override is not None:
+        logger.debug("Using caller-supplied mood interpretation")
+        interpretation = mood_override
+    else:
+        logger.debug("Interpreting mood using rule-based + optional Groq refinement")
+        interpretation = interpret_mood(mood_text, intense=intense, soft=soft)
     vector = interpretation.vector
     logger.debug(f"Mood vector: valence={vector.valence:.2f}, energy={vector.energy:.2f}, search_terms={interpretation.search_terms}")
 
-    service = SpotifyService()
-    try:
-        # Search for candidate tracks using mood interpretation
-        query = " ".join(interpretation.search_terms)
-        logger.info(f"Searching Spotify for: {query!r}")
-        # When duration_minutes is provided, use a large search limit to ensure we have enough tracks
-        # When only length is provided, use length-based limit
-        if duration_minutes and duration_minutes > 0:
-            search_limit = 100  # Large limit for duration-based selection
-        else:
-            search_limit = max((length or 12) * 3, 50)
-        candidates = service.search_tracks(query, limit=search_limit)
-        logger.debug(f"Found {len(candidates)} candidate tracks")
-
-        if not candidates:
-            logger.warning(f"No tracks found for search query: {query!r}")
-            return QueueResult(
-                mood_text=mood_text,
-                mood_vector=vector,
-                tracks=[],
-                summary="No tracks found for this mood.",
-            )
-
-        # Build tracks using metadata-only (no audio-features endpoint)
-        logger.info("Building queue using metadata-only mode (popularity, year, text heuristics)")
-        metadata_tracks: List[QueueTrack] = []
-        tracks_without_duration = 0
-        for t in candidates:
-            tid = t.get("id")
-            name = t.get("name", "<unknown>")
-            artists = ", ".join(a.get("name", "") for a in t.get("artists", []) or [])
-            uri = t.get("uri") or (f"spotify:track:{tid}" if tid else "<unknown>")
-            popularity = t.get("popularity")
-            
-            # Parse year from album.release_date if available
-            album = t.get("album") or {}
-            year_str = album.get("release_date") or ""
-            year: Optional[int] = None
-            if isinstance(year_str, str) and len(year_str) >= 4 and year_str[:4].isdigit():
-                year = int(year_str[:4])
-
-            duration_ms = t.get("duration_ms")
-            if duration_ms is None:
-                tracks_without_duration += 1
-
-            # Use track + album name for text-based heuristics
-            text = f"{name} {album.get('name', '')}"
-            valence, energy = _metadata_valence_energy(vector, interpretation, popularity, year, text)
-
-            metadata_tracks.append(
-                QueueTrack(
-                    name=name,
-                    artists=artists,
-                    uri=uri,
-                    valence=valence,
-                    energy=energy,
-                    popularity=popularity,
-                    year=year,
-                    duration_ms=duration_ms,
-                )
-            )
+    # Search for candidate tracks using mood interpretation
+    query = " ".join(interpretation.search_terms)
+    logger.info(f"Searching Spotify for: {query!r}")
+    # When duration_minutes is provided, use a large search limit to ensure we have enough tracks
+    # When only length is provided, use length-based limit
+    if duration_minutes and duration_minutes > 0:
+        search_limit = 100  # Large limit for duration-based selection
+    else:
+        search_limit = max((length or 12) * 3, 50)
+    candidates = service.search_tracks(query, limit=search_limit)
+    unique_candidates = _dedupe_candidates(candidates)
+    logger.debug(f"Found {len(candidates)} candidate tracks ({len(unique_candidates)} after de-duplication)")
+    candidates = unique_candidates
+
+    if not candidates:
+        logger.warning(f"No tracks found for search query: {query!r}")
+        return QueueResult(
+            mood_text=mood_text,
+            mood_vector=vector,
+            tracks=[],
+            summary="No tracks found for this mood.",
+            from_groq=interpretation.from_groq,
+        )
+
+    # Metadata-based ranking:
+    # - If mood prefers classics, favor older tracks; if recent, favor newer.
+    # - Otherwise, sort primarily by popularity (high to low).
+    # The preference flags are the same for every track, so they fold into two
+    # coefficients up front and the per-track score is a single multiply-add.
+    year_coef = 0.2 * (interpretation.prefer_recent - interpretation.prefer_classics)
+    pop_coef = 1.0 + 0.5 * (interpretation.prefer_popular - interpretation.prefer_obscure)
+
+    def meta_score(popularity: Optional[int], year: Optional[int]) -> float:
+        pop = popularity if popularity is not None else 0
+        year = year if year is not None else 0
+        return pop * pop_coef + (year - 2000) * year_coef
+
+    # Rank on the few fields the score needs; full QueueTracks (artist strings,
+    # text heuristics) are only built for the tracks that end up in the queue.
+    logger.info("Building queue using metadata-only mode (popularity, year, text heuristics)")
+    ranked: List[_Candidate] = []
+    tracks_without_duration = 0
+    for t in candidates:
+        popularity = t.get("popularity")
+
+        # Parse year from album.release_date if available.
+        # release_date is "YYYY", "YYYY-MM" or "YYYY-MM-DD"; slice once and validate
+        # the slice (isdigit keeps int() from accepting signs, spaces or "_").
+        year_str = (t.get("album") or {}).get("release_date")
+        head = year_str[:4] if isinstance(year_str, str) else ""
+        year: Optional[int] = int(head) if len(head) == 4 and head.isdigit() else None
+
+        duration_ms = t.get("duration_ms")
+        if duration_ms is None:
+            tracks_without_duration += 1
+
+        ranked.append(_Candidate(t, popularity, year, duration_ms, meta_score(popularity, year)))
+
+    if tracks_without_duration > 0:
+        logger.warning(f"Found {tracks_without_duration} tracks without duration_ms - duration-based selection may be inaccurate")
+    if duration_minutes and duration_minutes > 0:
+        tracks_with_duration = len(ranked) - tracks_without_duration
+        logger.info(f"Duration mode: {tracks_with_duration}/{len(ranked)} tracks have duration_ms")
+
+    # Choose tracks either by count or by duration target.
+    if duration_minutes and duration_minutes > 0:
+        # Prefix selection below walks the whole ranking, so it needs a full sort.
+        ranked.sort(key=_candidate_score, reverse=True)
+        target_seconds = duration_minutes * 60
+        tolerance = 3 * 60  # +/- 3 minutes
+
+        # Use prefix-based selection honoring ranking priority (mood match first).
+        # Evaluate prefixes to find the closest duration within tolerance; if none, pick closest overall.
+        best_idx = 0
+        best_diff = None
+        best_within_tol = False
+        best_total = 0
+        total_seconds = 0
         
-        if tracks_without_duration > 0:
-            logger.warning(f"Found {tracks_without_duration} tracks without duration_ms - duration-based selection may be inaccurate")
-        if duration_minutes and duration_minutes > 0:
-            tracks_with_duration = len(metadata_tracks) - tracks_without_duration
-            logger.info(f"Duration mode: {tracks_with_duration}/{len(metadata_tracks)} tracks have duration_ms")
-
-        # Metadata-based ranking:
-        # - If mood prefers classics, favor older tracks; if recent, favor newer.
-        # - Otherwise, sort primarily by popularity (high to low).
-        def meta_score(track: QueueTrack) -> float:
-            pop = track.popularity if track.popularity is not None else 0
-            year = track.year if track.year is not None else 0
-
-            score = float(pop)
-            if interpretation.prefer_recent:
-                score += (year - 2000) * 0.2  # reward newer tracks modestly
-            if interpretation.prefer_classics:
-                score -= (year - 2000) * 0.2  # reward older tracks modestly
-            if interpretation.prefer_obscure:
-                score -= pop * 0.5  # penalize mainstream a bit
-            if interpretation.prefer_popular:
-                score += pop * 0.5  # emphasize hits
-            return score
-
-        metadata_tracks.sort(key=meta_score, reverse=True)
-
-        # Choose tracks either by count or by duration target.
-        if duration_minutes and duration_minutes > 0:
-            target_seconds = duration_minutes * 60
-            tolerance = 3 * 60  # +/- 3 minutes
-            selected: List[QueueTrack] = []
-
-            # Use prefix-based selection honoring ranking priority (mood match first).
-            # Evaluate prefixes to find the closest duration within tolerance; if none, pick closest overall.
-            best_idx = 0
-            best_diff = None
-            best_within_tol = False
-            total_seconds = 0
-            
-            logger.info(f"Duration-based selection: target={target_seconds}s ({duration_minutes} min), tolerance=±{tolerance}s")
-            
-            for idx, track in enumerate(metadata_tracks, start=1):
-                dur_ms = track.duration_ms or 0
-                dur_sec = max(0, int(dur_ms / 1000))
-                total_seconds += dur_sec
-
-                diff = abs(total_seconds - target_seconds)
-                within_tol = total_seconds >= target_seconds - tolerance and total_seconds <= target_seconds + tolerance
-
-                # Logic: Prefer solutions within tolerance. If we have one within tolerance, only update if new one is also within tolerance and better.
-                # If we don't have one within tolerance yet, track the closest one.
-                should_update = False
-                if best_diff is None:
-                    # First iteration - always take it
+        logger.info(f"Duration-based selection: target={target_seconds}s ({duration_minutes} min), tolerance=±{tolerance}s")
+        
+        for idx, cand in enumerate(ranked, start=1):
+            dur_ms = cand.duration_ms or 0
+            dur_sec = max(0, int(dur_ms / 1000))
+            total_seconds += dur_sec
+
+            diff = abs(total_seconds - target_seconds)
+            within_tol = total_seconds >= target_seconds - tolerance and total_seconds <= target_seconds + tolerance
+
+            # Logic: Prefer solutions within tolerance. If we have one within tolerance, only update if new one is also within tolerance and better.
+            # If we don't have one within tolerance yet, track the closest one.
+            should_update = False
+            if best_diff is None:
+                # First iteration - always take it
+                should_update = True
+            elif within_tol and best_within_tol:
+                # Both within tolerance - pick the one closer to target
+                if diff < best_diff:
                     should_update = True
-                elif within_tol and best_within_tol:
-                    # Both within tolerance - pick the one closer to target
-                    if diff < best_diff:
-                        should_update = True
-                elif within_tol and not best_within_tol:
-                    # New one is within tolerance, old one wasn't - prefer the new one
+            elif within_tol and not best_within_tol:
+                # New one is within tolerance, old one wasn't - prefer the new one
+                should_update = True
+            elif not within_tol and not best_within_tol:
+                # Neither within tolerance - pick the one closer to target
+                if diff < best_diff:
                     should_update = True
-                elif not within_tol and not best_within_tol:
-                    # Neither within tolerance - pick the one closer to target
-                    if diff < best_diff:
-                        should_update = True
-
-                if should_update:
-                    best_idx = idx
-                    best_diff = diff
-                    best_within_tol = within_tol
-                    
-                # Log progress for debugging
-                if idx <= 5 or idx % 10 == 0 or within_tol:
-                    logger.debug(f"  Track {idx}: {track.name[:30]}... | dur={dur_sec}s | total={total_seconds}s | diff={diff}s | within_tol={within_tol}")
-
-            if best_idx == 0:
-                # Fallback: at least one track
-                logger.warning("Duration selection found no tracks, using fallback (1 track)")
-                best_idx = 1
-            else:
-                final_duration = sum((t.duration_ms or 0) / 1000 for t in metadata_tracks[:best_idx])
-                logger.info(f"Selected {best_idx} tracks with total duration {final_duration:.1f}s ({final_duration/60:.1f} min), target was {target_seconds}s ({duration_minutes} min)")
-
-            selected = metadata_tracks[:best_idx]
-        else:
-            selected = metadata_tracks[: max(1, length)]
-
-        # Sort by energy for a gentle rise
-        selected.sort(key=lambda t: t.energy)
-        energy_range = (selected[0].energy, selected[-1].energy) if selected else (0.0, 0.0)
-        logger.info(f"Metadata-only queue generated: {len(selected)} tracks, energy range: {energy_range[0]:.2f} - {energy_range[1]:.2f}")
-
-        # Summary
-        if selected:
-            start_v = selected[0].valence
-            end_v = selected[-1].valence
-            total_ms = sum(t.duration_ms or 0 for t in selected)
-            total_min = total_ms / 60000.0
-            target_text = f"Target duration: {duration_minutes} min. " if duration_minutes else ""
-            summary = (
-                target_text +
-                f"This queue starts at valence {start_v:.2f} and "
-                f"moves toward {end_v:.2f} (energy rises gently). "
-                f"Based on metadata-driven ranking (popularity, year, and text analysis). "
-                f"Approx. total duration: {total_min:.1f} min."
-            )
-        else:
-            summary = "Generated an empty queue."
 
-        return QueueResult(
-            mood_text=mood_text,
-            mood_vector=vector,
-            tracks=selected,
-            summary=summary,
+            if should_update:
+                best_idx = idx
+                best_diff = diff
+                best_within_tol = within_tol
+                best_total = total_seconds
+                
+            # Log progress for debugging
+            if idx <= 5 or idx % 10 == 0 or within_tol:
+                logger.debug(f"  Track {idx}: {cand.raw.get('name', '<unknown>')[:30]}... | dur={dur_sec}s | total={total_seconds}s | diff={diff}s | within_tol={within_tol}")
+
+        if best_idx == 0:
+            # Fallback: at least one track
+            logger.warning("Duration selection found no tracks, using fallback (1 track)")
+            best_idx = 1
+        else:
+            logger.info(f"Selected {best_idx} tracks with total duration {best_total}s ({best_total/60:.1f} min), target was {target_seconds}s ({duration_minutes} min)")
+
+        chosen = ranked[:best_idx]
+    else:
+        # nlargest is a partial (heap) selection with the same tie order as a stable
+        # descending sort. It also runs when every candidate fits: the energy sort
+        # below is stable, and energies often tie at the 0/1 clamp, so score order
+        # decides the final order of those tracks.
+        chosen = heapq.nlargest(max(1, length), ranked, key=_candidate_score)
+
+    baseline = _metadata_baseline(vector, interpretation)
+    selected = [_build_queue_track(cand, baseline) for cand in chosen]
+
+    # Sort by energy for a gentle rise
+    selected.sort(key=lambda t: t.energy)
+    energy_range = (selected[0].energy, selected[-1].energy) if selected else (0.0, 0.0)
+    logger.info(f"Metadata-only queue generated: {len(selected)} tracks, energy range: {energy_range[0]:.2f} - {energy_range[1]:.2f}")
+
+    # Summary
+    if selected:
+        start_v = selected[0].valence
+        end_v = selected[-1].valence
+        total_ms = sum(t.duration_ms or 0 for t in selected)
+        total_min = total_ms / 60000.0
+        target_text = f"Target duration: {duration_minutes} min. " if duration_minutes else ""
+        summary = (
+            target_text +
+            f"This queue starts at valence {start_v:.2f} and "
+            f"moves toward {end_v:.2f} (energy rises gently). "
+            f"Based on metadata-driven ranking (popularity, year, and text analysis). "
+            f"Approx. total duration: {total_min:.1f} min."
         )
-    finally:
-        service.close()
+    else:
+        summary = "Generated an empty queue."
+
+    return QueueResult(
+        mood_text=mood_text,
+        mood_vector=vector,
+        tracks=selected,
+        summary=summary,
+        from_groq=interpretation.from_groq,
+    )
 
 
-__all__ = ["QueueTrack", "QueueResult", "generate_queue"]
+__all__ = [
+    "QueueTrack",
+    "QueueResult",
+    "generate_queue",
+    "get_spotify_service",
+    "close_spotify_service",
+    "warmup",
+]
 
 
@@ -0,0 +1,57 @@
+"""
+Per-client token-bucket rate limiting for the SIMRAI API.
+
+Each bucket holds up to ``capacity`` tokens and refills continuously at
+``rate`` tokens per second; a request spends one token or is rejected. The API
+checks buckets from async dependencies, which all run on the event loop thread,
+so the bookkeeping needs no locking.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Hashable, Tuple
+
+
+class TokenBucketLimiter:
+    """
+    Independent token buckets keyed by client (typically the remote IP).
+
+    - ``per_minute`` sets both the burst size and the sustained refill rate.
+    - ``max_keys`` bounds memory. Buckets are kept in least-recently-seen order
+      and the oldest is dropped once the bound is exceeded, in O(1). An idle
+      client's bucket has refilled anyway, so recreating it is equivalent.
+    """
+
+    def __init__(self, per_minute: int, *, max_keys: int = 10_000) -> None:
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0
+        self._max_keys = max_keys
+        # key -> (tokens, last refill), least recently seen first
+        self._buckets: OrderedDict[Hashable, Tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Spend one token for ``key``.
+
+        Returns 0.0 when the request is allowed, otherwise the number of seconds
+        until a token becomes available.
+        """
+        now = monotonic()
+        buckets = self._buckets
+        tokens, last = buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        buckets[key] = (tokens, now)
+        if len(buckets) > self._max_keys:
+            buckets.popitem(last=False)
+        return 0.0 if allowed else (1.0 - tokens) / self.rate
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+__all__ = ["TokenBucketLimiter"]
@@ -13,14 +13,17 @@ Phase 1 scope:
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
-from time import time
+from time import monotonic
 from typing import Dict, List, Optional
 
 import base64
 
 import httpx
+import orjson
 
+from .cache import TTLCache
 from .config import AppConfig, SpotifyConfig, load_config
 
 logger = logging.getLogger(__name__)
@@ -42,15 +45,15 @@ class SpotifyAPIError(SpotifyError):
     """Non-auth API errors (network, rate limit, bad responses)."""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class _TokenInfo:
     access_token: str
-    expires_at: float
+    # Monotonic deadline, already 10s ahead of Spotify's expiry as a safety margin.
+    refresh_at: float
 
     @property
     def is_expired(self) -> bool:
-        # Add a small safety margin.
-        return time() >= self.expires_at - 10
+        return monotonic() >= self.refresh_at
 
 
 class DirectSpotifyClient:
@@ -64,12 +67,31 @@ class DirectSpotifyClient:
 
     def __init__(self, cfg: SpotifyConfig, *, timeout: float = 10.0) -> None:
         self._cfg = cfg
-        self._http = httpx.Client(timeout=timeout)
+        # HTTP/2 with a keep-alive pool: the shared client serves concurrent queue
+        # workers, which then multiplex over one TLS session instead of each
+        # opening their own.
+        self._http = httpx.Client(
+            timeout=timeout,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+        )
         self._token: Optional[_TokenInfo] = None
-
-        # Simple in-memory caches keyed by ID.
-        self._audio_features_cache: Dict[str, dict] = {}
-        self._track_cache: Dict[str, dict] = {}
+        # The client is shared by the /queue worker threads; only one of them
+        # fetches a token at a time and the rest reuse it.
+        self._token_lock = threading.Lock()
+        # Credentials are fixed for the client's lifetime; encode the Basic auth
+        # header once. Missing credentials are still reported on first use.
+        self._basic_auth = "Basic " + base64.b64encode(
+            f"{cfg.client_id}:{cfg.client_secret}".encode("utf-8")
+        ).decode("ascii")
+
+        # Bounded in-memory LRU caches keyed by ID (the client may live for the
+        # whole server process).
+        self._audio_features_cache: TTLCache[dict] = TTLCache(maxsize=4096)
+        self._track_cache: TTLCache[dict] = TTLCache(maxsize=4096)
+        # Search results keyed by (query, limit). Spotify marks them cacheable for
+        # about two minutes, so repeated moods skip the round-trip within that window.
+        self._search_cache: TTLCache[List[dict]] = TTLCache(maxsize=512, ttl=120)
 
     # --------------------------------------------------------------------- #
     # Authentication
@@ -85,20 +107,26 @@ class DirectSpotifyClient:
     def _get_access_token(self) -> str:
         self._ensure_credentials()
 
-        if self._token and not self._token.is_expired:
+        token = self._token
+        if token is not None and not token.is_expired:
             logger.debug("Using cached Spotify access token")
-            return self._token.access_token
+            return token.access_token
 
-        logger.info("Requesting new Spotify access token (client credentials)")
-        auth_header = base64.b64encode(
-            f"{self._cfg.client_id}:{self._cfg.client_secret}".encode("utf-8")
-        ).decode("utf-8")
+        with self._token_lock:
+            # Another worker may have fetched a token while this one waited.
+            token = self._token
+            if token is not None and not token.is_expired:
+                return token.access_token
+            return self._fetch_access_token()
 
+    def _fetch_access_token(self) -> str:
+        """Request a new client-credentials token. Caller holds `_token_lock`."""
+        logger.info("Requesting new Spotify access token (client credentials)")
         try:
             resp = self._http.post(
                 SPOTIFY_TOKEN_URL,
                 data={"grant_type": "client_credentials"},
-                headers={"Authorization": f"Basic {auth_header}"},
+                headers={"Authorization": self._basic_auth},
             )
         except httpx.HTTPError as exc:
             logger.error(f"Failed to contact Spotify token endpoint: {exc}")
@@ -110,7 +138,7 @@ class DirectSpotifyClient:
                 f"Spotify auth failed: {resp.status_code} {resp.text}"
             )
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         access_token = data.get("access_token")
         expires_in = int(data.get("expires_in", 3600))
 
@@ -120,7 +148,7 @@ class DirectSpotifyClient:
 
         self._token = _TokenInfo(
             access_token=access_token,
-            expires_at=time() + expires_in,
+            refresh_at=monotonic() + expires_in - 10,
         )
         logger.info(f"Spotify access token obtained (expires in {expires_in}s)")
         return access_token
@@ -144,7 +172,11 @@ class DirectSpotifyClient:
         if resp.status_code == 401:
             # Try once more with a fresh token.
             logger.warning(f"Spotify API returned 401 on {path}, retrying with fresh token")
-            self._token = None
+            with self._token_lock:
+                # Drop the rejected token unless another worker already replaced it.
+                current = self._token
+                if current is not None and current.access_token == token:
+                    self._token = None
             token = self._get_access_token()
             headers["Authorization"] = f"Bearer {token}"
             try:
@@ -160,7 +192,8 @@ class DirectSpotifyClient:
             )
 
         logger.debug(f"Spotify API request successful: {method} {path} -> {resp.status_code}")
-        return resp.json()
+        # orjson decodes the raw bytes directly (search pages run to ~100 KB).
+        return orjson.loads(resp.content)
 
     # --------------------------------------------------------------------- #
     # Public read-only methods
@@ -169,11 +202,20 @@ class DirectSpotifyClient:
         """
         Search for tracks by free-text query.
         """
+        limit = max(1, min(limit, 50))
+        # Spotify search ignores case and extra whitespace, so neither should
+        # split the cache.
+        cache_key = (" ".join(query.lower().split()), limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Spotify search cache hit: query={query!r}, limit={limit}")
+            return list(cached)
+
         logger.info(f"Searching Spotify tracks: query={query!r}, limit={limit}")
         params = {
             "q": query,
             "type": "track",
-            "limit": max(1, min(limit, 50)),
+            "limit": limit,
         }
         data = self._request("GET", "/search", params=params)
         items = data.get("tracks", {}).get("items", [])
@@ -182,8 +224,9 @@ class DirectSpotifyClient:
         for item in items:
             track_id = item.get("id")
             if track_id:
-                self._track_cache[track_id] = item
-        return items
+                self._track_cache.set(track_id, item)
+        self._search_cache.set(cache_key, items)
+        return list(items)
 
     def get_audio_features(self, track_ids: List[str]) -> Dict[str, dict]:
         """
@@ -191,11 +234,16 @@ class DirectSpotifyClient:
 
         Returns a mapping {track_id: features_dict}.
         """
+        result: Dict[str, dict] = {}
+
         # Filter IDs we don't already have cached.
-        missing_ids = [tid for tid in track_ids if tid not in self._audio_features_cache]
+        for tid in track_ids:
+            cached = self._audio_features_cache.get(tid)
+            if cached is not None:
+                result[tid] = cached
+        missing_ids = [tid for tid in track_ids if tid not in result]
         cached_count = len(track_ids) - len(missing_ids)
         logger.debug(f"Fetching audio features: {len(missing_ids)} new, {cached_count} cached")
-        result: Dict[str, dict] = {}
 
         # Spotify supports up to 100 IDs per audio-features request.
         for i in range(0, len(missing_ids), 100):
@@ -211,18 +259,25 @@ class DirectSpotifyClient:
             features_list = data.get("audio_features", []) or []
             logger.debug(f"Retrieved audio features for {len(features_list)} tracks")
             for features in features_list:
-                tid = features.get("id")
+                tid = features.get("id") if features else None
                 if tid:
-                    self._audio_features_cache[tid] = features
-
-        # Build result from cache.
-        for tid in track_ids:
-            if tid in self._audio_features_cache:
-                result[tid] = self._audio_features_cache[tid]
+                    self._audio_features_cache.set(tid, features)
+                    result[tid] = features
 
         logger.info(f"Audio features retrieved: {len(result)}/{len(track_ids)} tracks")
         return result
 
+    def warmup(self) -> None:
+        """
+        Pre-fetch the client-credentials token so the first search skips the round-trip.
+
+        Failures are logged and swallowed; the next real request surfaces them.
+        """
+        try:
+            self._get_access_token()
+        except SpotifyError as exc:
+            logger.debug(f"Spotify warmup skipped: {exc}")
+
     def close(self) -> None:
         logger.debug("Closing DirectSpotifyClient HTTP connection")
         self._http.close()
@@ -248,6 +303,10 @@ class McpSpotifyClient:
     def get_audio_features(self, track_ids: List[str]) -> Dict[str, dict]:
         raise NotImplementedError("MCP-based Spotify audio features are not implemented yet.")
 
+    def warmup(self) -> None:
+        # Nothing to pre-fetch until MCP wiring exists.
+        return None
+
     def close(self) -> None:
         # Placeholder for symmetry with DirectSpotifyClient.
         return None
@@ -288,6 +347,9 @@ class SpotifyService:
     def get_audio_features(self, track_ids: List[str]) -> Dict[str, dict]:
         return self._backend.get_audio_features(track_ids)
 
+    def warmup(self) -> None:
+        self._backend.warmup()
+
     def close(self) -> None:
         self._backend.close()
 